@@ -0,0 +1,149 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import User
+
+from .metrics import registry
+
+USER_CLAIMS = ("username", "role", "is_superuser")
+USER_STATE_KEY = "auth:user-state:{}:{}"
+USER_GENERATION_KEY = "auth:user-generation:{}"
+REVOKED = "revoked"
+
+
+def _get_user_state(user):
+    return (user.username, user.role, user.is_superuser, user.is_active)
+
+
+def _state_timeout():
+    return int(settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds())
+
+
+def _get_state_key(user_id):
+    # данные хранятся под ключом текущего поколения: запись, которая
+    # прочитала базу до изменения пользователя, попадет в ключ старого
+    # поколения и не перезапишет новые данные
+    generation = cache.get_or_set(
+        USER_GENERATION_KEY.format(user_id), uuid4().hex, timeout=None
+    )
+    return USER_STATE_KEY.format(user_id, generation)
+
+
+def _publish_states(states):
+    """
+    После фиксации транзакции начинает новые поколения данных
+    пользователей {id: данные или None}, None - прочитать из базы.
+    """
+
+    def publish():
+        generations = {user_id: uuid4().hex for user_id in states}
+        cache.set_many(
+            {
+                USER_STATE_KEY.format(user_id, generations[user_id]): state
+                for user_id, state in states.items()
+                if state is not None
+            },
+            _state_timeout(),
+        )
+        cache.set_many(
+            {
+                USER_GENERATION_KEY.format(user_id): generation
+                for user_id, generation in generations.items()
+            },
+            None,
+        )
+
+    transaction.on_commit(publish)
+
+
+def get_access_token(user):
+    """Выпускает токен доступа с данными пользователя в claims."""
+    token = AccessToken.for_user(user)
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def store_user_state(user):
+    """
+    Запоминает актуальные данные пользователя для проверки токенов
+    после фиксации транзакции, откаченное изменение не публикуется.
+    """
+    _publish_states({user.pk: _get_user_state(user)})
+
+
+def forget_user_states(user_ids):
+    """
+    Сбрасывает данные пользователей после фиксации транзакции,
+    следующий запрос с их токенами перечитает данные из базы.
+    """
+    _publish_states(dict.fromkeys(user_ids))
+
+
+def revoke_user_tokens(user_id):
+    """Делает недействительными все выпущенные токены пользователя."""
+    _publish_states({user_id: REVOKED})
+
+
+def get_user_state(user_id):
+    """
+    Возвращает актуальные данные пользователя из кеша.
+    К базе данных обращается только при промахе кеша.
+    """
+    key = _get_state_key(user_id)
+    state = cache.get(key)
+    registry.inc(
+        "yamdb_auth_state_cache_requests_total",
+        result="miss" if state is None else "hit",
+    )
+    if state is None:
+        state = (
+            User.objects.filter(pk=user_id)
+            .values_list("username", "role", "is_superuser", "is_active")
+            .first()
+        ) or REVOKED
+        cache.add(key, state, _state_timeout())
+    return state
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT без чтения пользователя из базы данных.
+
+    Пользователь собирается из claims токена, выпущенного CustomTokenView.
+    Смена username, роли, прав суперпользователя, деактивация или удаление
+    пользователя отзывают его токены: claims сверяются с данными
+    пользователя в кеше, которые обновляют сигналы модели User
+    (в том числе users_updated после QuerySet.update()).
+    Полученный объект нельзя сохранять, для изменения пользователя
+    его нужно заново загрузить из базы.
+
+    Если кеш не общий для процессов (CACHE_SHARED), другие процессы
+    не увидели бы отзыв токенов, поэтому пользователь, как в
+    JWTAuthentication, загружается из базы данных при каждом запросе.
+    """
+
+    def get_user(self, validated_token):
+        if not settings.CACHE_SHARED or any(
+            claim not in validated_token for claim in USER_CLAIMS
+        ):
+            return super().get_user(validated_token)
+        user = User(
+            pk=validated_token[api_settings.USER_ID_CLAIM],
+            username=validated_token["username"],
+            role=validated_token["role"],
+            is_superuser=validated_token["is_superuser"],
+            is_active=True,
+        )
+        if get_user_state(user.pk) != _get_user_state(user):
+            raise AuthenticationFailed(
+                "Токен устарел, получите новый.", code="token_outdated"
+            )
+        user._state.adding = False
+        return user
@@ -0,0 +1,828 @@
+import asyncio
+import json
+import math
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from copy import deepcopy
+from io import BytesIO, StringIO
+from itertools import islice
+from types import SimpleNamespace
+from urllib.parse import urlencode
+from uuid import uuid4
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management import call_command
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections, transaction
+from django.db.models import Count
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import OutboxEmail, User
+
+from . import cache, conditional, slugs
+from .authentication import get_access_token
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer, orjson
+from .serializers import (
+    CommentSerializer,
+    ReviewSerializer,
+    TitleSerializerRead,
+)
+from .throttling import (
+    CreateRateThrottle,
+    ReadRateThrottle,
+    TokenBucketThrottle,
+)
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+PREFIX = "bench"
+REVIEWS_PER_TITLE = 20
+GENRES = 20
+CATEGORIES = 5
+TRANSPORTS = ("wsgi", "asgi")
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def get_dataset_size(reviews):
+    """Возвращает размер синтетического набора данных по числу отзывов."""
+    return {
+        "users": max(reviews // 100, REVIEWS_PER_TITLE * 2),
+        "categories": CATEGORIES,
+        "genres": GENRES,
+        "titles": max(math.ceil(reviews / REVIEWS_PER_TITLE), 1),
+        "reviews": reviews,
+        "comments": reviews // 2,
+    }
+
+
+def is_seeded():
+    return Title.objects.filter(name__startswith=f"{PREFIX} ").exists()
+
+
+def _bulk_create(model, objects, batch_size):
+    objects = iter(objects)
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+
+
+def _ids(queryset):
+    return list(queryset.order_by("id").values_list("id", flat=True))
+
+
+def seed(reviews, batch_size=5000, random_seed=0, log=print):
+    """
+    Создает синтетический набор данных через модели reviews и users.
+    Набор детерминирован для одного random_seed: у каждого произведения
+    до REVIEWS_PER_TITLE отзывов разных авторов, комментариев вдвое
+    меньше, чем отзывов. Сигналы при bulk_create не вызываются,
+    поэтому рейтинги и кеш ответов обновляются в конце.
+    """
+    rng = random.Random(random_seed)
+    size = get_dataset_size(reviews)
+    password = make_password(None)
+
+    _bulk_create(
+        User,
+        (
+            User(
+                username=f"{PREFIX}-user-{number}",
+                email=f"{PREFIX}-user-{number}@example.com",
+                password=password,
+            )
+            for number in range(size["users"])
+        ),
+        batch_size,
+    )
+    user_ids = _ids(User.objects.filter(username__startswith=f"{PREFIX}-"))
+    log(f"users: {len(user_ids)}")
+
+    Category.objects.bulk_create(
+        Category(
+            name=f"{PREFIX} category {number}", slug=f"{PREFIX}-c{number}"
+        )
+        for number in range(size["categories"])
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f"{PREFIX} genre {number}", slug=f"{PREFIX}-g{number}")
+        for number in range(size["genres"])
+    )
+    category_ids = _ids(Category.objects.filter(slug__startswith=PREFIX))
+    genre_ids = _ids(Genre.objects.filter(slug__startswith=PREFIX))
+
+    _bulk_create(
+        Title,
+        (
+            Title(
+                name=f"{PREFIX} title {number}",
+                year=rng.randint(1950, 2022),
+                description=f"Описание произведения {number}",
+                category_id=rng.choice(category_ids),
+            )
+            for number in range(size["titles"])
+        ),
+        batch_size,
+    )
+    title_ids = _ids(Title.objects.filter(name__startswith=f"{PREFIX} "))
+    _bulk_create(
+        Title.genre.through,
+        (
+            Title.genre.through(title_id=title_id, genre_id=genre_id)
+            for title_id in title_ids
+            for genre_id in rng.sample(genre_ids, rng.randint(1, 2))
+        ),
+        batch_size,
+    )
+    log(f"titles: {len(title_ids)}")
+
+    def generate_reviews():
+        left = size["reviews"]
+        for title_id in title_ids:
+            count = min(REVIEWS_PER_TITLE, left)
+            left -= count
+            for author_id in rng.sample(user_ids, count):
+                yield Review(
+                    title_id=title_id,
+                    author_id=author_id,
+                    text=f"Отзыв на произведение {title_id}",
+                    score=rng.randint(1, 10),
+                )
+
+    _bulk_create(Review, generate_reviews(), batch_size)
+    review_ids = _ids(
+        Review.objects.filter(title__name__startswith=f"{PREFIX} ")
+    )
+    log(f"reviews: {len(review_ids)}")
+
+    _bulk_create(
+        Comment,
+        (
+            Comment(
+                review_id=rng.choice(review_ids),
+                author_id=rng.choice(user_ids),
+                text=f"Комментарий {number}",
+            )
+            for number in range(size["comments"])
+        ),
+        batch_size,
+    )
+    log(f"comments: {size['comments']}")
+
+    call_command("recalculate_ratings", stdout=StringIO())
+    cache.invalidate()
+    conditional.touch_all()
+    slugs.invalidate_all()
+    return size
+
+
+def _titles_list(context, number):
+    return "get", "/api/v1/titles/", None, None
+
+
+def _titles_filter(context, number):
+    return (
+        "get",
+        "/api/v1/titles/",
+        {
+            "genre": context["genre"],
+            "category": context["category"],
+            "year_min": 1990,
+        },
+        None,
+    )
+
+
+def _titles_cursor(context, number):
+    return "get", "/api/v1/titles/", {"pagination": "cursor"}, None
+
+
+def _title_detail(context, number):
+    return "get", f"/api/v1/titles/{context['title']}/", None, None
+
+
+def _reviews_list(context, number):
+    return "get", f"/api/v1/titles/{context['title']}/reviews/", None, None
+
+
+def _comments_list(context, number):
+    return (
+        "get",
+        f"/api/v1/titles/{context['title']}/reviews/"
+        f"{context['review']}/comments/",
+        None,
+        None,
+    )
+
+
+def _signup(context, number):
+    username = f"{context['run']}-{number}"
+    return (
+        "post",
+        "/api/v1/auth/signup/",
+        {"username": username, "email": f"{username}@example.com"},
+        None,
+    )
+
+
+def _token(context, number):
+    return (
+        "post",
+        "/api/v1/auth/token/",
+        {
+            "username": context["writer"].username,
+            "confirmation_code": context["confirmation_code"],
+        },
+        None,
+    )
+
+
+def _review_create(context, number):
+    title_ids = context["title_ids"]
+    return (
+        "post",
+        f"/api/v1/titles/{title_ids[number % len(title_ids)]}/reviews/",
+        {"text": f"Отзыв {number}", "score": number % 10 + 1},
+        context["token"],
+    )
+
+
+def _comment_create(context, number):
+    return (
+        "post",
+        f"/api/v1/titles/{context['title']}/reviews/"
+        f"{context['review']}/comments/",
+        {"text": f"Комментарий {number}"},
+        context["token"],
+    )
+
+
+# Сценарий по номеру запроса возвращает метод, путь, данные и токен.
+SCENARIOS = {
+    "titles_list": _titles_list,
+    "titles_filter": _titles_filter,
+    "titles_cursor": _titles_cursor,
+    "title_detail": _title_detail,
+    "reviews_list": _reviews_list,
+    "comments_list": _comments_list,
+    "signup": _signup,
+    "token": _token,
+    "review_create": _review_create,
+    "comment_create": _comment_create,
+}
+
+
+def percentile(ordered, percent):
+    """Перцентиль по методу ближайшего ранга для отсортированного списка."""
+    index = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def _get_commit():
+    try:
+        result = subprocess.run(
+            ("git", "rev-parse", "--short", "HEAD"),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+class _Response:
+    def __init__(self, latency, status, headers):
+        self.latency = latency
+        self.status = status
+        self.headers = headers
+
+
+def _build_environ(request):
+    method, path, query, body, headers = request
+    environ = {
+        "REQUEST_METHOD": method,
+        "SCRIPT_NAME": "",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in headers.items():
+        key = name.upper().replace("-", "_")
+        if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = f"HTTP_{key}"
+        environ[key] = value
+    return environ
+
+
+def _build_scope(request):
+    method, path, query, body, headers = request
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [
+            (name.encode("latin1"), value.encode("latin1"))
+            for name, value in headers.items()
+        ],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+
+
+class Benchmark:
+    """
+    Прогоняет сценарии через полный стек Django (middleware, DRF,
+    сериализаторы, база данных) в текущем процессе без сетевого сервера.
+
+    В режиме wsgi запросы обрабатывает WSGI-обработчик Django
+    в concurrency потоках, как воркер gunicorn с потоками. В режиме asgi
+    одновременно выполняются concurrency запросов к ASGI-приложению
+    api_yamdb.asgi в цикле событий. client_delay имитирует медленного
+    клиента: в режиме wsgi задержка занимает поток, в режиме asgi
+    ожидание происходит в цикле событий. Ограничения частоты запросов
+    (api.throttling) на время замера отключаются, если throttle не задан.
+    Данные, созданные сценариями записи, удаляются в cleanup.
+    """
+
+    def __init__(
+        self,
+        requests=200,
+        warmup=20,
+        concurrency=1,
+        transport="wsgi",
+        client_delay=0.0,
+        throttle=False,
+    ):
+        self.requests = requests
+        self.warmup = warmup
+        self.concurrency = concurrency
+        self.transport = transport
+        self.client_delay = client_delay
+        self.throttle = throttle
+        self.context = {}
+
+    def prepare(self):
+        title = (
+            Title.objects.order_by("-rating_count", "id")
+            .select_related("category")
+            .first()
+        )
+        if title is None:
+            raise LookupError("Нет данных, выполните seed_benchmark_data.")
+        review = (
+            Review.objects.filter(title=title)
+            .annotate(comment_count=Count("comments"))
+            .order_by("-comment_count", "id")
+            .first()
+        )
+        run = f"{PREFIX}-run-{uuid4().hex[:8]}"
+        writer = User.objects.create(
+            username=f"{run}-writer", email=f"{run}-writer@example.com"
+        )
+        self.context = {
+            "run": run,
+            "title": title.pk,
+            "review": review.pk if review else None,
+            "category": title.category.slug if title.category else "",
+            "genre": title.genre.values_list("slug", flat=True).first(),
+            "title_ids": _ids(Title.objects.all())[
+                : self.warmup + self.requests
+            ],
+            "writer": writer,
+            "token": str(get_access_token(writer)),
+            "confirmation_code": default_token_generator.make_token(writer),
+        }
+
+    def cleanup(self):
+        run = self.context["run"]
+        User.objects.filter(username__startswith=run).delete()
+        OutboxEmail.objects.filter(recipient__startswith=run).delete()
+
+    def build_request(self, scenario, number):
+        method, path, data, token = SCENARIOS[scenario](self.context, number)
+        headers = {}
+        query, body = "", b""
+        if method == "get":
+            query = urlencode(data or {})
+        else:
+            body = json.dumps(data).encode()
+            headers["content-type"] = "application/json"
+            headers["content-length"] = str(len(body))
+        if token is not None:
+            headers["authorization"] = f"Bearer {token}"
+        return method.upper(), path, query, body, headers
+
+    def _send_wsgi(self, handler, request):
+        result = {}
+
+        def start_response(status, headers, exc_info=None):
+            result["status"] = int(status.split(" ", 1)[0])
+            result["headers"] = {
+                name.lower(): value for name, value in headers
+            }
+
+        started = time.perf_counter()
+        time.sleep(self.client_delay)
+        chunks = handler(_build_environ(request), start_response)
+        try:
+            for _ in chunks:
+                pass
+        finally:
+            chunks.close()
+        return _Response(
+            time.perf_counter() - started,
+            result["status"],
+            result["headers"],
+        )
+
+    def _run_wsgi_worker(self, scenario, numbers):
+        handler = get_wsgi_application()
+        try:
+            return [
+                self._send_wsgi(
+                    handler, self.build_request(scenario, number)
+                )
+                for number in numbers
+            ]
+        finally:
+            if self.concurrency > 1:
+                connections.close_all()
+
+    def _run_wsgi(self, scenario, numbers):
+        if self.concurrency == 1:
+            return self._run_wsgi_worker(scenario, numbers)
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            chunks = executor.map(
+                lambda offset: self._run_wsgi_worker(
+                    scenario, numbers[offset::self.concurrency]
+                ),
+                range(self.concurrency),
+            )
+            return [response for chunk in chunks for response in chunk]
+
+    async def _send_asgi(self, application, request, semaphore):
+        body = request[3]
+        messages = []
+
+        async def receive():
+            await asyncio.sleep(self.client_delay)
+            return {"type": "http.request", "body": body}
+
+        async def send(message):
+            messages.append(message)
+
+        async with semaphore:
+            started = time.perf_counter()
+            await application(_build_scope(request), receive, send)
+            latency = time.perf_counter() - started
+        return _Response(
+            latency,
+            messages[0]["status"],
+            {
+                name.decode("latin1"): value.decode("latin1")
+                for name, value in messages[0]["headers"]
+            },
+        )
+
+    async def _run_asgi_requests(self, scenario, numbers):
+        from api_yamdb.asgi import application
+
+        lifespan_in, lifespan_out = asyncio.Queue(), asyncio.Queue()
+        lifespan = asyncio.ensure_future(
+            application(
+                {"type": "lifespan"}, lifespan_in.get, lifespan_out.put
+            )
+        )
+        await lifespan_in.put({"type": "lifespan.startup"})
+        await lifespan_out.get()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            return await asyncio.gather(
+                *(
+                    self._send_asgi(
+                        application,
+                        self.build_request(scenario, number),
+                        semaphore,
+                    )
+                    for number in numbers
+                )
+            )
+        finally:
+            await lifespan_in.put({"type": "lifespan.shutdown"})
+            await lifespan
+
+    def _run_asgi(self, scenario, numbers):
+        return asyncio.run(self._run_asgi_requests(scenario, numbers))
+
+    def run_scenario(self, scenario):
+        send = self._run_asgi if self.transport == "asgi" else self._run_wsgi
+        send(scenario, range(self.warmup))
+        started = time.perf_counter()
+        responses = send(
+            scenario, range(self.warmup, self.warmup + self.requests)
+        )
+        return summarize(responses, time.perf_counter() - started)
+
+    def run(self, scenarios):
+        started_at = timezone.now()
+        self.prepare()
+        try:
+            # все запросы обрабатывает текущий процесс, поэтому
+            # его локальный кеш на время замера общий; число SQL-запросов
+            # берется из заголовка Server-Timing
+            throttle_rates = _throttle_rates(None if self.throttle else {})
+            with throttle_rates, override_settings(
+                CACHE_SHARED=True, SERVER_TIMING=True
+            ):
+                results = {
+                    scenario: self.run_scenario(scenario)
+                    for scenario in scenarios
+                }
+        finally:
+            self.cleanup()
+        return {
+            "started_at": started_at.isoformat(),
+            "commit": _get_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "dataset": {
+                "titles": Title.objects.count(),
+                "reviews": Review.objects.count(),
+                "comments": Comment.objects.count(),
+            },
+            "transport": self.transport,
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "client_delay_ms": self.client_delay * 1000,
+            "throttle": self.throttle,
+            "scenarios": results,
+        }
+
+
+def _throttle_rates(rates):
+    """
+    Подменяет DEFAULT_THROTTLE_RATES на время замера, пустые частоты
+    отключают ограничения. При rates=None настройки не меняются.
+    """
+    if rates is None:
+        return nullcontext()
+    return override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {
+                scope: rates.get(scope)
+                for scope in api_settings.DEFAULT_THROTTLE_RATES
+            },
+        }
+    )
+
+
+def _count_queries(response):
+    match = QUERIES_RE.search(response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else 0
+
+
+def summarize(responses, duration):
+    """Сводит замеры запросов в пропускную способность и перцентили."""
+    latencies = sorted(response.latency * 1000 for response in responses)
+    count = len(responses)
+    return {
+        "requests": count,
+        "errors": sum(1 for response in responses if response.status >= 400),
+        "statuses": sorted({response.status for response in responses}),
+        "throughput_rps": round(count / duration, 1) if duration else None,
+        "latency_ms": {
+            "mean": round(sum(latencies) / count, 3),
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3),
+        },
+        "queries_per_request": round(
+            sum(_count_queries(response) for response in responses) / count,
+            2,
+        ),
+        "cache_hits": sum(
+            1
+            for response in responses
+            if response.headers.get("x-cache") == "HIT"
+        ),
+    }
+
+
+def _measure(func, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    timings.sort()
+    return {
+        "mean_us": round(sum(timings) / rounds, 2),
+        "p50_us": round(percentile(timings, 50), 2),
+        "p95_us": round(percentile(timings, 95), 2),
+        "p99_us": round(percentile(timings, 99), 2),
+    }
+
+
+def _compare(standard, fast, rounds):
+    result = {
+        "standard": _measure(standard, rounds),
+        "fast": _measure(fast, rounds),
+    }
+    result["speedup"] = round(
+        result["standard"]["p50_us"] / result["fast"]["p50_us"], 2
+    )
+    return result
+
+
+def _get_title_page(size=100):
+    titles = (
+        Title.objects.select_related("category")
+        .prefetch_related("genre")
+        .order_by("id")[:size]
+    )
+    return {
+        "count": Title.objects.count(),
+        "next": None,
+        "previous": None,
+        "results": TitleSerializerRead(titles, many=True).data,
+    }
+
+
+def benchmark_json(rounds=1000):
+    """
+    Сравнивает JSONRenderer и JSONParser DRF с версиями на orjson
+    на странице из 100 произведений TitleSerializerRead.
+    """
+    data = _get_title_page()
+    standard, fast = JSONRenderer(), FastJSONRenderer()
+    body = standard.render(data)
+    return {
+        "orjson": orjson is not None,
+        "titles": len(data["results"]),
+        "payload_bytes": len(body),
+        "identical": fast.render(data) == body
+        and FastJSONParser().parse(BytesIO(body)) == json.loads(body),
+        "render": _compare(
+            lambda: standard.render(data), lambda: fast.render(data), rounds
+        ),
+        "parse": _compare(
+            lambda: JSONParser().parse(BytesIO(body)),
+            lambda: FastJSONParser().parse(BytesIO(body)),
+            rounds,
+        ),
+    }
+
+
+def _use_stock_lists(serializer):
+    """
+    Заменяет вложенные списки сериализатора (например, жанры
+    произведения) стандартным ListSerializer DRF вместо
+    Meta.list_serializer_class и возвращает сериализатор.
+    """
+    for name, field in list(serializer.fields.items()):
+        if isinstance(field, serializers.ListSerializer):
+            serializer.fields[name] = serializers.ListSerializer(
+                *field._args,
+                **{
+                    **field._kwargs,
+                    "child": _use_stock_lists(deepcopy(field.child)),
+                },
+            )
+        elif isinstance(field, serializers.BaseSerializer):
+            _use_stock_lists(field)
+    return serializer
+
+
+def _stock_list_serializer(serializer_class, objects):
+    """Список объектов, сериализуемый только стандартными классами DRF."""
+    return serializers.ListSerializer(
+        objects, child=_use_stock_lists(serializer_class())
+    )
+
+
+def _compare_serializer(serializer_class, objects, rounds):
+    renderer = JSONRenderer()
+
+    def standard():
+        return _stock_list_serializer(serializer_class, objects).data
+
+    def fast():
+        return serializer_class(objects, many=True).data
+
+    result = _compare(standard, fast, rounds)
+    result["objects"] = len(objects)
+    result["identical"] = renderer.render(standard()) == renderer.render(
+        fast()
+    )
+    return result
+
+
+def benchmark_serializers(rounds=1000):
+    """
+    Сравнивает стандартный ListSerializer и FastListSerializer
+    на страницах из 100 произведений, отзывов и комментариев.
+    Объекты загружаются заранее, замеряется только сериализация.
+    """
+    titles = list(
+        Title.objects.select_related("category")
+        .prefetch_related("genre")
+        .order_by("id")[:100]
+    )
+    reviews = list(
+        Review.objects.select_related("author").order_by("-id")[:100]
+    )
+    comments = list(
+        Comment.objects.select_related("author").order_by("-id")[:100]
+    )
+    return {
+        "titles": _compare_serializer(TitleSerializerRead, titles, rounds),
+        "reviews": _compare_serializer(ReviewSerializer, reviews, rounds),
+        "comments": _compare_serializer(CommentSerializer, comments, rounds),
+    }
+
+
+def benchmark_throttle(rounds=1000):
+    """
+    Замеряет время проверки ReadRateThrottle и CreateRateThrottle
+    на кеше из настроек: пропущенный запрос (чтение и запись корзины)
+    и отклоненный (только чтение). Цель - не больше 100 мкс на p99.
+    """
+    user = User(pk=0, username=f"{PREFIX}-throttle")
+    request = Request(RequestFactory().get("/api/v1/titles/"))
+    request.user = user
+    anonymous = Request(RequestFactory().get("/api/v1/titles/"))
+    anonymous.user = AnonymousUser()
+    view = SimpleNamespace(action="create", create_throttle_scope="reviews")
+    scopes = ("user_read", "anon_read", "reviews")
+    # большая частота не дает корзине опустеть во время замера
+    with _throttle_rates(dict.fromkeys(scopes, f"{rounds * 10}/s")):
+        result = {
+            "user_read": _measure(
+                lambda: ReadRateThrottle().allow_request(request, view),
+                rounds,
+            ),
+            "anon_read": _measure(
+                lambda: ReadRateThrottle().allow_request(anonymous, view),
+                rounds,
+            ),
+        }
+    with _throttle_rates(dict.fromkeys(scopes, "1/day")):
+        CreateRateThrottle().allow_request(request, view)
+        result["throttled"] = _measure(
+            lambda: CreateRateThrottle().allow_request(request, view), rounds
+        )
+    TokenBucketThrottle.cache.delete_many(
+        TokenBucketThrottle.cache_format.format(scope=scope, ident=ident)
+        for scope, ident in (
+            ("user_read", user.pk),
+            ("anon_read", "127.0.0.1"),
+            ("reviews", user.pk),
+        )
+    )
+    result["under_100us"] = all(
+        timings["p99_us"] < 100 for timings in result.values()
+    )
+    return result
+
+
+MICRO_BENCHMARKS = {
+    "json": benchmark_json,
+    "serializers": benchmark_serializers,
+    "throttle": benchmark_throttle,
+}
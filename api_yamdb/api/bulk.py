@@ -0,0 +1,312 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import SlugRelatedField
+from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
+from reviews.models import Category, Genre, Title
+
+from . import cache, conditional, slugs
+from .serializers import (
+    BulkCategorySerializer,
+    BulkGenreSerializer,
+    BulkTitleSerializer,
+)
+
+CREATED = "created"
+UPDATED = "updated"
+ERROR = "error"
+
+DUPLICATE_MESSAGE = "Значение повторяется в другом элементе запроса."
+NOT_FOUND_MESSAGE = SlugRelatedField.default_error_messages["does_not_exist"]
+
+
+class BulkWriter:
+    """
+    Массовое создание и обновление объектов одной модели.
+
+    Элементы проверяются сериализатором без запросов к базе, затем
+    resolve проверяет всю пачку за фиксированное число запросов
+    (слаги, уникальность), save записывает ее через bulk_create
+    и bulk_update в одной транзакции. Сигналы моделей при этом
+    не вызываются, поэтому кеш ответов сбрасывается вручную.
+    """
+
+    serializer_class = None
+    result_field = None
+
+    def __init__(self, upsert=False):
+        self.upsert = upsert
+        self.results = {}
+
+    @property
+    def has_errors(self):
+        return any(
+            result["status"] == ERROR for result in self.results.values()
+        )
+
+    def add_error(self, index, errors):
+        self.results[index] = {
+            "index": index,
+            "status": ERROR,
+            "errors": errors,
+        }
+
+    def add_result(self, index, status, obj):
+        self.results[index] = {
+            "index": index,
+            "status": status,
+            self.result_field: getattr(obj, self.result_field),
+        }
+
+    def validate(self, items):
+        """
+        Проверяет элементы и возвращает список пар (индекс, объект)
+        для записи, ошибки запоминаются в results.
+        """
+        rows = []
+        for index, item in enumerate(items):
+            serializer = self.serializer_class(data=item)
+            if serializer.is_valid():
+                rows.append((index, serializer.validated_data))
+            else:
+                self.add_error(index, serializer.errors)
+        return self.resolve(rows)
+
+    def resolve(self, rows):
+        raise NotImplementedError
+
+    def save(self, objects):
+        try:
+            with transaction.atomic():
+                self.write(objects)
+        except IntegrityError:
+            raise ValidationError(
+                {"detail": "Данные изменились во время записи, повторите."}
+            )
+        cache.invalidate()
+        conditional.touch("titles")
+
+    def write(self, objects):
+        raise NotImplementedError
+
+    def report(self):
+        results = [self.results[index] for index in sorted(self.results)]
+        return {
+            CREATED: sum(result["status"] == CREATED for result in results),
+            UPDATED: sum(result["status"] == UPDATED for result in results),
+            "errors": sum(result["status"] == ERROR for result in results),
+            "results": results,
+        }
+
+
+class SlugModelBulkWriter(BulkWriter):
+    """
+    Массовая загрузка категорий и жанров. Существующий объект
+    ищется по slug, при upsert у него обновляется name, а у его
+    произведений (title_lookup) - updated_at, как в сигналах
+    touch_titles_on_category_change и touch_titles_on_genre_change.
+    """
+
+    model = None
+    result_field = "slug"
+    title_lookup = None
+
+    def save(self, objects):
+        super().save(objects)
+        slugs.SLUG_MAPS[self.model].invalidate()
+
+    def find_errors(self, data, existing, names, seen):
+        slug, name = data["slug"], data["name"]
+        errors = {}
+        if slug in seen["slug"]:
+            errors["slug"] = [DUPLICATE_MESSAGE]
+        elif slug in existing and not self.upsert:
+            errors["slug"] = [UniqueValidator.message]
+        if name in seen["name"]:
+            errors["name"] = [DUPLICATE_MESSAGE]
+        elif names.get(name, slug) != slug:
+            errors["name"] = [UniqueValidator.message]
+        seen["slug"].add(slug)
+        seen["name"].add(name)
+        return errors
+
+    def resolve(self, rows):
+        existing = {
+            obj.slug: obj
+            for obj in self.model.objects.filter(
+                Q(slug__in=[data["slug"] for _, data in rows])
+                | Q(name__in=[data["name"] for _, data in rows])
+            )
+        }
+        names = {obj.name: obj.slug for obj in existing.values()}
+        seen = {"slug": set(), "name": set()}
+        objects = []
+        for index, data in rows:
+            errors = self.find_errors(data, existing, names, seen)
+            if errors:
+                self.add_error(index, errors)
+                continue
+            obj = existing.get(data["slug"])
+            if obj is None:
+                obj = self.model(**data)
+            obj.name = data["name"]
+            objects.append((index, obj))
+        return objects
+
+    def write(self, objects):
+        statuses = [
+            (index, obj, CREATED if obj.pk is None else UPDATED)
+            for index, obj in objects
+        ]
+        self.model.objects.bulk_create(
+            obj for _, obj, status in statuses if status == CREATED
+        )
+        updated = [obj for _, obj, status in statuses if status == UPDATED]
+        self.model.objects.bulk_update(updated, ["name"])
+        if updated:
+            Title.objects.filter(**{self.title_lookup: updated}).update(
+                updated_at=timezone.now()
+            )
+        for index, obj, status in statuses:
+            self.add_result(index, status, obj)
+
+
+class CategoryBulkWriter(SlugModelBulkWriter):
+    model = Category
+    serializer_class = BulkCategorySerializer
+    title_lookup = "category__in"
+
+
+class GenreBulkWriter(SlugModelBulkWriter):
+    model = Genre
+    serializer_class = BulkGenreSerializer
+    title_lookup = "genre__in"
+
+
+class TitleBulkWriter(BulkWriter):
+    """
+    Массовая загрузка произведений. Категории и жанры всей пачки
+    ищутся по слагам двумя запросами, существующие произведения -
+    одним запросом по ключу уникальности (name, year, category).
+    При upsert у существующего произведения заменяются жанры
+    и описание, если оно передано. Жанры записываются
+    в промежуточную таблицу пачкой.
+    """
+
+    serializer_class = BulkTitleSerializer
+    result_field = "id"
+    unique_fields = ("name", "year", "category")
+
+    def __init__(self, upsert=False):
+        super().__init__(upsert)
+        self.genre_ids = {}
+
+    def get_key(self, data):
+        return data["name"], data["year"], data["category"]
+
+    def find_errors(self, data, categories, genres, existing, seen):
+        errors = {}
+        if data["category"] not in categories:
+            errors["category"] = [
+                NOT_FOUND_MESSAGE.format(
+                    slug_name="slug", value=data["category"]
+                )
+            ]
+        unknown = [slug for slug in data["genre"] if slug not in genres]
+        if unknown:
+            errors["genre"] = [
+                NOT_FOUND_MESSAGE.format(slug_name="slug", value=slug)
+                for slug in unknown
+            ]
+        key = self.get_key(data)
+        if key in seen or (key in existing and not self.upsert):
+            errors["non_field_errors"] = [
+                UniqueTogetherValidator.message.format(
+                    field_names=", ".join(self.unique_fields)
+                )
+            ]
+        seen.add(key)
+        return errors
+
+    def resolve(self, rows):
+        categories = dict(
+            Category.objects.filter(
+                slug__in={data["category"] for _, data in rows}
+            ).values_list("slug", "id")
+        )
+        genres = dict(
+            Genre.objects.filter(
+                slug__in={slug for _, data in rows for slug in data["genre"]}
+            ).values_list("slug", "id")
+        )
+        existing = {
+            (title.name, title.year, title.category.slug): title
+            for title in Title.objects.filter(
+                name__in={data["name"] for _, data in rows},
+                year__in={data["year"] for _, data in rows},
+                category__slug__in=categories,
+            ).select_related("category")
+        }
+        seen = set()
+        objects = []
+        for index, data in rows:
+            errors = self.find_errors(data, categories, genres, existing, seen)
+            if errors:
+                self.add_error(index, errors)
+                continue
+            title = existing.get(self.get_key(data))
+            if title is None:
+                title = Title(
+                    name=data["name"],
+                    year=data["year"],
+                    category_id=categories[data["category"]],
+                )
+            if "description" in data:
+                title.description = data["description"]
+            self.genre_ids[index] = {genres[slug] for slug in data["genre"]}
+            objects.append((index, title))
+        return objects
+
+    def set_created_ids(self, titles):
+        """
+        Заполняет id созданных произведений, если база данных
+        не возвращает их из bulk_create (например, SQLite).
+        """
+        keys = {
+            (title.name, title.year, title.category_id): title
+            for title in titles
+        }
+        for pk, *key in Title.objects.filter(
+            name__in={title.name for title in titles},
+            year__in={title.year for title in titles},
+            category_id__in={title.category_id for title in titles},
+        ).values_list("id", "name", "year", "category_id"):
+            if tuple(key) in keys:
+                keys[tuple(key)].pk = pk
+
+    def write(self, objects):
+        statuses = [
+            (index, title, CREATED if title.pk is None else UPDATED)
+            for index, title in objects
+        ]
+        created = [title for _, title, status in statuses if status == CREATED]
+        updated = [title for _, title, status in statuses if status == UPDATED]
+        Title.objects.bulk_create(created)
+        if any(title.pk is None for title in created):
+            self.set_created_ids(created)
+        now = timezone.now()
+        for title in updated:
+            title.updated_at = now
+        Title.objects.bulk_update(updated, ["description", "updated_at"])
+        through = Title.genre.through
+        through.objects.filter(
+            title_id__in=[title.pk for title in updated]
+        ).delete()
+        through.objects.bulk_create(
+            through(title_id=title.pk, genre_id=genre_id)
+            for index, title in objects
+            for genre_id in self.genre_ids[index]
+        )
+        for index, title, status in statuses:
+            self.add_result(index, status, title)
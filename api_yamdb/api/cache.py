@@ -0,0 +1,98 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from .metrics import registry
+from .replicas import read_from_replica, replicas_enabled
+
+VERSION_KEY = "api:responses:version"
+HITS_KEY = "api:responses:hits"
+MISSES_KEY = "api:responses:misses"
+RECENT_WRITE_KEY = "api:responses:recent-write"
+
+
+def get_cache():
+    return caches[settings.API_RESPONSE_CACHE_ALIAS]
+
+
+def _incr(key):
+    cache = get_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+def get_version():
+    return get_cache().get_or_set(VERSION_KEY, 1, timeout=None)
+
+
+def _bump_version():
+    _incr(VERSION_KEY)
+    if replicas_enabled():
+        get_cache().set(
+            RECENT_WRITE_KEY, True, settings.DATABASE_REPLICA_STICKY_SECONDS
+        )
+
+
+def invalidate():
+    """
+    Делает недействительными все закешированные ответы API после
+    фиксации текущей транзакции. При сбросе до фиксации параллельный
+    запрос мог бы закешировать старые данные под новой версией.
+    """
+    transaction.on_commit(_bump_version)
+
+
+def may_be_stale():
+    """
+    Проверяет, мог ли текущий запрос прочитать с реплики данные,
+    устаревшие относительно недавней записи. Такие ответы нельзя
+    кешировать: после сброса кеш заполнился бы старыми данными.
+    """
+    return read_from_replica() and bool(get_cache().get(RECENT_WRITE_KEY))
+
+
+def make_key(request):
+    path_hash = md5(request.get_full_path().encode()).hexdigest()
+    return f"api:responses:{get_version()}:{path_hash}"
+
+
+def get_stats():
+    """Возвращает счетчики попаданий и промахов кеша ответов."""
+    values = get_cache().get_many((HITS_KEY, MISSES_KEY))
+    return {
+        "hits": values.get(HITS_KEY, 0),
+        "misses": values.get(MISSES_KEY, 0),
+    }
+
+
+class CachedListMixin:
+    """
+    Mixin, кеширующий сериализованные данные ответа на запрос списка.
+    Ключ строится по пути и строке запроса (включая номер страницы),
+    кеш сбрасывается сигналами моделей при любом изменении данных
+    после фиксации транзакции.
+    """
+
+    def list(self, request, *args, **kwargs):
+        key = make_key(request)
+        data = get_cache().get(key)
+        if data is not None:
+            _incr(HITS_KEY)
+            registry.inc("yamdb_response_cache_requests_total", result="hit")
+            return Response(data, headers={"X-Cache": "HIT"})
+        _incr(MISSES_KEY)
+        registry.inc("yamdb_response_cache_requests_total", result="miss")
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200 and not may_be_stale():
+            get_cache().set(
+                key, response.data, settings.API_RESPONSE_CACHE_TIMEOUT
+            )
+        response["X-Cache"] = "MISS"
+        return response
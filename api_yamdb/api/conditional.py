@@ -0,0 +1,115 @@
+import time
+from hashlib import md5
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .cache import get_cache, may_be_stale
+from .metrics import registry
+
+STAMP_KEY = "api:stamps:{}"
+GLOBAL_STAMP_KEY = STAMP_KEY.format("*")
+
+
+def get_stamp(collection):
+    """
+    Возвращает метку последнего изменения коллекции.
+    При пустом кеше метка начинается с текущего момента,
+    поэтому клиент в худшем случае один раз получит полный ответ.
+    """
+    cache = get_cache()
+    key = STAMP_KEY.format(collection)
+    stamps = cache.get_many((key, GLOBAL_STAMP_KEY))
+    if key not in stamps:
+        stamps[key] = time.time()
+        cache.add(key, stamps[key], timeout=None)
+    return max(stamps.values())
+
+
+def _set_stamps(keys):
+    now = time.time()
+    get_cache().set_many(dict.fromkeys(keys, now), timeout=None)
+
+
+def touch(*collections):
+    """
+    Отмечает изменение переданных коллекций после фиксации текущей
+    транзакции, иначе читатель мог бы получить новую метку вместе
+    со старыми данными и затем 304 на устаревший ответ.
+    """
+    keys = [STAMP_KEY.format(collection) for collection in collections]
+    transaction.on_commit(lambda: _set_stamps(keys))
+
+
+def touch_all():
+    """Отмечает изменение всех коллекций, например после массовой загрузки."""
+    transaction.on_commit(lambda: _set_stamps([GLOBAL_STAMP_KEY]))
+
+
+def _make_etag(*parts):
+    return '"%s"' % md5(":".join(map(str, parts)).encode()).hexdigest()
+
+
+def _timestamp(value):
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return int(value.timestamp())
+
+
+def _set_validators(request, response, etag, last_modified=None):
+    if (
+        "HTTP_IF_NONE_MATCH" in request.META
+        or "HTTP_IF_MODIFIED_SINCE" in request.META
+    ):
+        registry.inc(
+            "yamdb_conditional_requests_total",
+            result="not_modified" if response.status_code == 304 else "full",
+        )
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Mixin, отвечающий 304 Not Modified на условные GET-запросы.
+    Для списка ETag строится по метке коллекции stamp_collection
+    без обращения к базе, для объекта ETag и Last-Modified - по его
+    полю updated_at. Сериализатор в обоих случаях не вызывается.
+    Список не отдает Last-Modified: с точностью до секунды
+    If-Modified-Since пропустил бы изменения в ту же секунду,
+    а ETag меняется с каждой меткой.
+    """
+
+    stamp_collection = None
+
+    def get_stamp_collection(self):
+        return self.stamp_collection.format(**self.kwargs)
+
+    def list(self, request, *args, **kwargs):
+        stamp = get_stamp(self.get_stamp_collection())
+        etag = _make_etag(request.get_full_path(), stamp)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+            if may_be_stale():
+                # валидаторы новой метки нельзя отдавать с данными реплики
+                return response
+        return _set_validators(request, response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = _make_etag(request.get_full_path(), instance.updated_at)
+        last_modified = _timestamp(instance.updated_at)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            serializer = self.get_serializer(instance)
+            response = Response(serializer.data)
+        return _set_validators(request, response, etag, last_modified)
@@ -0,0 +1,136 @@
+import csv
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from reviews.models import Comment, Review, Title
+
+TITLE_FIELDS = (
+    "id",
+    "name",
+    "year",
+    "description",
+    "category__slug",
+    "rating_sum",
+    "rating_count",
+    "updated_at",
+)
+REVIEW_FIELDS = (
+    "id",
+    "title_id",
+    "author__username",
+    "text",
+    "score",
+    "pub_date",
+)
+COMMENT_FIELDS = (
+    "id",
+    "review_id",
+    "review__title_id",
+    "author__username",
+    "text",
+    "pub_date",
+)
+
+
+def _iterate_by_id(queryset):
+    """Читает строки пачками по id, первое поле строки - id."""
+    last_id = None
+    while True:
+        page = queryset if last_id is None else queryset.filter(id__gt=last_id)
+        rows = list(page[:settings.EXPORT_CHUNK_SIZE])
+        yield from rows
+        if len(rows) < settings.EXPORT_CHUNK_SIZE:
+            return
+        last_id = rows[-1][0]
+
+
+def _iterate(queryset, fields):
+    """
+    Итерирует строки через серверный курсор без кеша QuerySet,
+    поэтому память не зависит от размера таблицы. Если серверные
+    курсоры отключены (DB_PGBOUNCER), iterator() загрузил бы весь
+    результат сразу, и строки читаются пачками по id.
+    """
+    queryset = queryset.order_by("id").values_list(*fields)
+    if connections[queryset.db].settings_dict.get(
+        "DISABLE_SERVER_SIDE_CURSORS"
+    ):
+        return _iterate_by_id(queryset)
+    return queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+def _export_titles(since):
+    queryset = Title.objects.all()
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    rows = _iterate(queryset, TITLE_FIELDS)
+    while True:
+        chunk = list(islice(rows, settings.EXPORT_CHUNK_SIZE))
+        if not chunk:
+            return
+        genres = {}
+        links = Title.genre.through.objects.filter(
+            title_id__in=[row[0] for row in chunk]
+        ).values_list("title_id", "genre__slug")
+        for title_id, slug in links:
+            genres.setdefault(title_id, []).append(slug)
+        for row in chunk:
+            yield row + (genres.get(row[0], []),)
+
+
+def _export_model(model, fields, since):
+    queryset = model.objects.all()
+    if since is not None:
+        queryset = queryset.filter(pub_date__gte=since)
+    return _iterate(queryset, fields)
+
+
+def export_rows(dataset, since=None):
+    """
+    Возвращает заголовок и генератор строк для набора данных.
+    Произведения фильтруются по updated_at, отзывы и комментарии
+    по pub_date. Жанры произведений подгружаются одним запросом
+    на каждую пачку строк.
+    """
+    if dataset == "titles":
+        return TITLE_FIELDS + ("genres",), _export_titles(since)
+    if dataset == "reviews":
+        return REVIEW_FIELDS, _export_model(Review, REVIEW_FIELDS, since)
+    return COMMENT_FIELDS, _export_model(Comment, COMMENT_FIELDS, since)
+
+
+def _column(name):
+    return name.replace("__", "_")
+
+
+def render_ndjson(header, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    columns = [_column(name) for name in header]
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + "\n"
+
+
+class _Echo:
+    """Псевдо-файл, отдающий записанную строку вместо ее хранения."""
+
+    def write(self, value):
+        return value
+
+
+def render_csv(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([_column(name) for name in header])
+    for row in rows:
+        yield writer.writerow(
+            ",".join(value) if isinstance(value, list) else value
+            for value in row
+        )
+
+
+RENDERERS = {
+    "ndjson": (render_ndjson, "application/x-ndjson; charset=utf-8"),
+    "csv": (render_csv, "text/csv; charset=utf-8"),
+}
+DATASETS = ("titles", "reviews", "comments")
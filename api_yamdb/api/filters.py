@@ -1,19 +1,47 @@
 from django_filters import rest_framework as filters
 from reviews.models import Title
 
+from .slugs import category_slugs, genre_slugs
+
 
 class TitleFilter(filters.FilterSet):
-    """Фильтр для модели Title."""
+    """
+    Фильтр для модели Title.
+    Год и слаги сравниваются точно, чтобы запрос шел по индексам.
+    Слаги категории и жанра переводятся в id по процессному
+    справочнику (api.slugs), поэтому таблицы категорий и жанров
+    в запрос не попадают. Без общего кеша слаги сравниваются
+    в том же запросе через JOIN.
+    Поиск по названию регистронезависимый, на PostgreSQL он
+    обслуживается триграммным индексом (миграция reviews 0012).
+    """
 
-    category = filters.CharFilter(
-        field_name="category__slug", lookup_expr="icontains"
-    )
-    genre = filters.CharFilter(
-        field_name="genre__slug", lookup_expr="icontains"
-    )
+    category = filters.CharFilter(method="filter_category")
+    genre = filters.CharFilter(method="filter_genre")
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
-    year = filters.NumberFilter(field_name="year", lookup_expr="icontains")
+    year = filters.NumberFilter(field_name="year")
+    year_min = filters.NumberFilter(field_name="year", lookup_expr="gte")
+    year_max = filters.NumberFilter(field_name="year", lookup_expr="lte")
 
     class Meta:
         model = Title
-        fields = "__all__"
+        fields = ("name", "year", "description", "category", "genre")
+
+    def filter_category(self, queryset, name, value):
+        lookup = category_slugs.get_lookup("category", value)
+        if lookup is None:
+            return queryset.none()
+        return queryset.filter(**lookup)
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Фильтрация по жанру через подзапрос к промежуточной таблице.
+        В отличие от JOIN по genre__slug не размножает строки произведений.
+        """
+        lookup = genre_slugs.get_lookup("genre", value)
+        if lookup is None:
+            return queryset.none()
+        titles_with_genre = Title.genre.through.objects.filter(
+            **lookup
+        ).values("title_id")
+        return queryset.filter(id__in=titles_with_genre)
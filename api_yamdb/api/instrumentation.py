@@ -0,0 +1,144 @@
+import threading
+import time
+from contextlib import ExitStack
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+
+class QueryRecorder:
+    """Execute wrapper, считающий SQL-запросы и время их выполнения."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            if len(self.statements) < 50:
+                self.statements.append(sql)
+
+    def record(self):
+        """Контекстный менеджер, подключающий счетчик ко всем базам."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+
+class RequestStats:
+    """Агрегированная статистика запросов в пределах одного процесса."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def add(self, view, queries, db_time, serializer_time, total_time):
+        with self._lock:
+            stats = self._views.setdefault(
+                view,
+                {
+                    "requests": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "db_time": 0.0,
+                    "serializer_time": 0.0,
+                    "total_time": 0.0,
+                    "max_total_time": 0.0,
+                },
+            )
+            stats["requests"] += 1
+            stats["queries"] += queries
+            stats["max_queries"] = max(stats["max_queries"], queries)
+            stats["db_time"] += db_time
+            stats["serializer_time"] += serializer_time
+            stats["total_time"] += total_time
+            stats["max_total_time"] = max(stats["max_total_time"], total_time)
+
+    def snapshot(self):
+        """Возвращает средние значения по каждому view в миллисекундах."""
+        with self._lock:
+            views = {view: dict(stats) for view, stats in self._views.items()}
+        result = {}
+        for view, stats in sorted(views.items()):
+            requests = stats["requests"]
+            result[view] = {
+                "requests": requests,
+                "avg_queries": round(stats["queries"] / requests, 2),
+                "max_queries": stats["max_queries"],
+                "avg_db_ms": round(stats["db_time"] * 1000 / requests, 3),
+                "avg_serializer_ms": round(
+                    stats["serializer_time"] * 1000 / requests, 3
+                ),
+                "avg_total_ms": round(
+                    stats["total_time"] * 1000 / requests, 3
+                ),
+                "max_total_ms": round(stats["max_total_time"] * 1000, 3),
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+request_stats = RequestStats()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _check_budget(recorder, limit, name):
+    if recorder.queries > limit:
+        raise QueryBudgetExceeded(
+            f"{name}: {recorder.queries} SQL-запросов при бюджете "
+            f"{limit}:\n" + "\n".join(recorder.statements)
+        )
+
+
+def _limit_queries(method, limit, name):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        if not settings.QUERY_BUDGET_ENFORCE:
+            return method(*args, **kwargs)
+        recorder = QueryRecorder()
+        try:
+            with recorder.record():
+                return method(*args, **kwargs)
+        finally:
+            _check_budget(recorder, limit, name)
+
+    return wrapper
+
+
+def query_budget(**budgets):
+    """
+    Декоратор ViewSet, объявляющий максимальное число SQL-запросов
+    для действий: @query_budget(list=3, retrieve=2).
+    Проверка включается настройкой QUERY_BUDGET_ENFORCE (в тестах),
+    превышение бюджета вызывает QueryBudgetExceeded.
+    """
+
+    def decorator(view_class):
+        for action, limit in budgets.items():
+            setattr(
+                view_class,
+                action,
+                _limit_queries(
+                    getattr(view_class, action),
+                    limit,
+                    f"{view_class.__name__}.{action}",
+                ),
+            )
+        view_class.query_budgets = budgets
+        return view_class
+
+    return decorator
@@ -0,0 +1,129 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Прогоняет сценарии нагрузки на API в текущем процессе и выводит "
+        "пропускную способность и перцентили времени ответа в JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            nargs="+",
+            choices=benchmarks.SCENARIOS,
+            help="Сценарии для запуска (по умолчанию все).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Количество замеряемых запросов в каждом сценарии.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=20,
+            help="Количество запросов для прогрева перед замером.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Количество потоков, отправляющих запросы.",
+        )
+        parser.add_argument(
+            "--transport",
+            choices=benchmarks.TRANSPORTS,
+            default="wsgi",
+            help="Через какой интерфейс отправлять запросы: WSGI-обработчик "
+            "в потоках или ASGI-приложение в цикле событий.",
+        )
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=0,
+            help="Задержка медленного клиента перед каждым запросом, мс.",
+        )
+        parser.add_argument(
+            "--throttle",
+            action="store_true",
+            help="Не отключать ограничения частоты запросов на время замера.",
+        )
+        parser.add_argument(
+            "--test-db",
+            action="store_true",
+            help="Создать временную тестовую базу, заполнить ее "
+            "набором --scale и удалить после замера.",
+        )
+        parser.add_argument(
+            "--scale",
+            choices=benchmarks.SCALES,
+            default="10k",
+            help="Размер набора данных для --test-db.",
+        )
+        parser.add_argument(
+            "--micro",
+            choices=benchmarks.MICRO_BENCHMARKS,
+            help="Запустить микробенчмарк вместо сценариев нагрузки.",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=1000,
+            help="Количество повторов в микробенчмарке.",
+        )
+        parser.add_argument(
+            "--output", help="Файл для результата (по умолчанию stdout)."
+        )
+
+    def handle(self, *args, **options):
+        if options["test_db"]:
+            result = self.run_on_test_db(options)
+        else:
+            result = self.run(options)
+
+        output = json.dumps(result, ensure_ascii=False, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def run(self, options):
+        if options["micro"]:
+            return benchmarks.MICRO_BENCHMARKS[options["micro"]](
+                rounds=options["rounds"]
+            )
+        benchmark = benchmarks.Benchmark(
+            requests=options["requests"],
+            warmup=options["warmup"],
+            concurrency=options["concurrency"],
+            transport=options["transport"],
+            client_delay=options["client_delay"] / 1000,
+            throttle=options["throttle"],
+        )
+        try:
+            return benchmark.run(
+                options["scenario"] or list(benchmarks.SCENARIOS)
+            )
+        except LookupError as error:
+            raise CommandError(error)
+
+    def run_on_test_db(self, options):
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            benchmarks.seed(
+                benchmarks.SCALES[options["scale"]], log=self.stderr.write
+            )
+            return self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -0,0 +1,132 @@
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import resolve
+from reviews.models import Category, Genre, Review, Title
+
+LIST_QUERIES = {
+    "titles": "/api/v1/titles/",
+    "titles_filter": "/api/v1/titles/?genre={genre}&category={category}",
+    "titles_cursor": "/api/v1/titles/?pagination=cursor",
+    "categories": "/api/v1/categories/",
+    "genres": "/api/v1/genres/",
+    "reviews": "/api/v1/titles/{title}/reviews/",
+    "reviews_cursor": "/api/v1/titles/{title}/reviews/?pagination=cursor",
+    "comments": "/api/v1/titles/{title}/reviews/{review}/comments/",
+    "comments_cursor": (
+        "/api/v1/titles/{title}/reviews/{review}/comments/?pagination=cursor"
+    ),
+    "users": "/api/v1/users/",
+}
+
+
+class _QueryRecorder:
+    """Запоминает SQL и параметры запросов, не меняя их выполнение."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def get_sample_context():
+    """
+    Возвращает идентификаторы для подстановки в пути списков:
+    произведение с наибольшим числом отзывов и его последний отзыв.
+    """
+    title = Title.objects.order_by("-rating_count", "id").first()
+    genre = Genre.objects.first()
+    category = Category.objects.first()
+    if title is None or genre is None or category is None:
+        raise CommandError(
+            "В базе нет произведений, жанров или категорий, "
+            "заполните ее, например, командой seed_benchmark_data."
+        )
+    review = Review.objects.filter(title=title).first()
+    return {
+        "title": title.id,
+        "review": review.id if review is not None else 0,
+        "genre": genre.slug,
+        "category": category.slug,
+    }
+
+
+def record_list_queries(path):
+    """
+    Выполняет действие list для пути так же, как view: get_queryset,
+    фильтры и пагинация, но без проверки прав и кеша ответов.
+    Возвращает выполненные SQL-запросы с параметрами.
+    """
+    match = resolve(urlsplit(path).path)
+    view = match.func.cls(**match.func.initkwargs)
+    view.action_map = match.func.actions
+    view.args = ()
+    view.kwargs = match.kwargs
+    view.format_kwarg = None
+    view.request = view.initialize_request(RequestFactory().get(path))
+    recorder = _QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        view.paginate_queryset(view.filter_queryset(view.get_queryset()))
+    return recorder.queries
+
+
+def explain(sql, params, explain_format=None, **options):
+    prefix = connection.ops.explain_query_prefix(explain_format, **options)
+    with connection.cursor() as cursor:
+        cursor.execute(f"{prefix} {sql}", params)
+        rows = cursor.fetchall()
+    return "\n".join(
+        row[0] if len(row) == 1 else " ".join(str(column) for column in row)
+        for row in rows
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Выводит планы EXPLAIN для всех SQL-запросов, которые выполняют "
+        "списки API. Используйте после изменения схемы или индексов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoint",
+            nargs="+",
+            choices=LIST_QUERIES,
+            help="Списки для проверки (по умолчанию все).",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Выполнить запросы и показать фактическое время "
+            "(EXPLAIN ANALYZE, только PostgreSQL).",
+        )
+        parser.add_argument(
+            "--format",
+            dest="explain_format",
+            help="Формат плана, например json (поддерживается PostgreSQL).",
+        )
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options["analyze"]:
+            explain_options["analyze"] = True
+        context = get_sample_context()
+        for name in options["endpoint"] or LIST_QUERIES:
+            path = LIST_QUERIES[name].format(**context)
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}: {path}"))
+            for sql, params in record_list_queries(path):
+                self.stdout.write(self.style.SQL_KEYWORD(sql))
+                try:
+                    plan = explain(
+                        sql,
+                        params,
+                        options["explain_format"],
+                        **explain_options,
+                    )
+                except ValueError as error:
+                    raise CommandError(error)
+                self.stdout.write(plan + "\n")
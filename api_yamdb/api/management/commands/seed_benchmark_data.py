@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Создает синтетический набор данных для бенчмарков "
+        "(10k, 100k или 1m отзывов)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            choices=benchmarks.SCALES,
+            default="10k",
+            help="Размер набора данных по числу отзывов.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Количество объектов, создаваемых одним запросом.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Начальное значение генератора случайных чисел.",
+        )
+
+    def handle(self, *args, **options):
+        if benchmarks.is_seeded():
+            raise CommandError(
+                "Данные для бенчмарков уже созданы, используйте чистую базу."
+            )
+        size = benchmarks.seed(
+            benchmarks.SCALES[options["scale"]],
+            batch_size=options["batch_size"],
+            random_seed=options["seed"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано {size['titles']} произведений, "
+                f"{size['reviews']} отзывов и {size['comments']} комментариев."
+            )
+        )
@@ -0,0 +1,268 @@
+import glob
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HELP = {
+    "yamdb_http_requests_total": (
+        "counter",
+        "Количество HTTP-запросов по view, методу и статусу.",
+    ),
+    "yamdb_http_request_duration_seconds": (
+        "histogram",
+        "Время обработки HTTP-запроса по view.",
+    ),
+    "yamdb_db_queries_total": (
+        "counter",
+        "Количество SQL-запросов по view.",
+    ),
+    "yamdb_db_connections_opened_total": (
+        "counter",
+        "Количество открытых соединений с базой данных.",
+    ),
+    "yamdb_db_connections_reused_total": (
+        "counter",
+        "Количество запросов, выполненных на уже открытом соединении.",
+    ),
+    "yamdb_response_cache_requests_total": (
+        "counter",
+        "Обращения к кешу ответов API по результату (hit/miss).",
+    ),
+    "yamdb_conditional_requests_total": (
+        "counter",
+        "Ответы на GET-запросы с валидаторами по результату "
+        "(not_modified/full).",
+    ),
+    "yamdb_auth_state_cache_requests_total": (
+        "counter",
+        "Обращения к кешу состояния пользователей при проверке JWT.",
+    ),
+    "yamdb_throttle_requests_total": (
+        "counter",
+        "Проверки ограничения частоты запросов по scope и результату.",
+    ),
+    "yamdb_signups_total": (
+        "counter",
+        "Количество регистраций пользователей.",
+    ),
+    "yamdb_email_outbox_pending": (
+        "gauge",
+        "Количество писем, ожидающих отправки.",
+    ),
+    "yamdb_email_outbox_failed": (
+        "gauge",
+        "Количество писем, исчерпавших попытки отправки.",
+    ),
+}
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Registry:
+    """
+    Хранилище метрик одного процесса.
+
+    При заданном METRICS_DIR каждый процесс периодически сохраняет снимок
+    своих метрик в файл <pid>.json, а /metrics складывает снимки всех
+    процессов, поэтому метрики корректны для нескольких воркеров gunicorn.
+    Снимок завершившегося воркера мастер gunicorn переносит в общий
+    архив (archive_process), поэтому счетчики не уменьшаются, а число
+    файлов не растет при перезапуске воркеров.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._flushed_at = 0.0
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (
+                    len(DURATION_BUCKETS) + 2
+                )
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def dump(self):
+        with self._lock:
+            return {
+                "counters": [
+                    [name, labels, value]
+                    for (name, labels), value in self._counters.items()
+                ],
+                "histograms": [
+                    [name, labels, list(values)]
+                    for (name, labels), values in self._histograms.items()
+                ],
+            }
+
+    def maybe_flush(self):
+        """Сохраняет снимок метрик процесса не чаще METRICS_FLUSH_INTERVAL."""
+        if not settings.METRICS_DIR:
+            return
+        now = time.monotonic()
+        if now - self._flushed_at < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self.flush()
+
+    def flush(self):
+        """Сохраняет снимок метрик процесса в METRICS_DIR."""
+        if not settings.METRICS_DIR:
+            return
+        self._flushed_at = time.monotonic()
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        _write_snapshot(_get_process_file(os.getpid()), self.dump())
+
+
+registry = Registry()
+
+ARCHIVE_FILE = "archive.json"
+
+
+def _get_process_file(pid):
+    return os.path.join(settings.METRICS_DIR, f"{pid}.json")
+
+
+def _read_snapshot(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_snapshot(path, snapshot):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(snapshot, file)
+    os.replace(temp_path, path)
+
+
+def _merge(snapshots):
+    counters, histograms = {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in snapshot["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, [0] * len(values))
+            for index, value in enumerate(values):
+                merged[index] += value
+    return counters, histograms
+
+
+def collect():
+    """Складывает метрики всех процессов."""
+    snapshots = [registry.dump()]
+    if settings.METRICS_DIR:
+        own_file = _get_process_file(os.getpid())
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.json")):
+            if path == own_file:
+                continue
+            snapshot = _read_snapshot(path)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+    return _merge(snapshots)
+
+
+def archive_process(pid):
+    """
+    Добавляет метрики завершившегося процесса в архив и удаляет
+    его снимок. Вызывается мастером gunicorn (child_exit), поэтому
+    архив изменяет только один процесс.
+    """
+    if not settings.METRICS_DIR:
+        return
+    path = _get_process_file(pid)
+    snapshot = _read_snapshot(path)
+    if snapshot is None:
+        return
+    archive_path = os.path.join(settings.METRICS_DIR, ARCHIVE_FILE)
+    archive = _read_snapshot(archive_path)
+    counters, histograms = _merge(
+        [snapshot] if archive is None else [archive, snapshot]
+    )
+    _write_snapshot(
+        archive_path,
+        {
+            "counters": [
+                [name, labels, value]
+                for (name, labels), value in counters.items()
+            ],
+            "histograms": [
+                [name, labels, values]
+                for (name, labels), values in histograms.items()
+            ],
+        },
+    )
+    os.remove(path)
+
+
+def clear():
+    """Удаляет снимки предыдущего запуска сервера."""
+    if not settings.METRICS_DIR:
+        return
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.json*")):
+        os.remove(path)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name, str(value).replace("\\", "\\\\").replace('"', '\\"')
+        )
+        for name, value in labels
+    )
+    return "{%s}" % pairs
+
+
+def render(gauges):
+    """Формирует текст метрик в формате экспозиции Prometheus."""
+    counters, histograms = collect()
+    samples = {}
+    for (name, labels), value in sorted(counters.items(), key=str):
+        samples.setdefault(name, []).append(
+            f"{name}{_format_labels(labels)} {value}"
+        )
+    for (name, labels), values in sorted(histograms.items(), key=str):
+        lines = samples.setdefault(name, [])
+        buckets = zip(DURATION_BUCKETS + ("+Inf",), values[:-2] + values[-1:])
+        for bound, count in buckets:
+            bucket_labels = labels + (("le", bound),)
+            lines.append(
+                f"{name}_bucket{_format_labels(bucket_labels)} {count}"
+            )
+        lines.append(f"{name}_sum{_format_labels(labels)} {values[-2]}")
+        lines.append(f"{name}_count{_format_labels(labels)} {values[-1]}")
+    for name, value in gauges.items():
+        samples[name] = [f"{name} {value}"]
+
+    output = []
+    for name in sorted(samples):
+        metric_type, help_text = HELP.get(name, ("untyped", ""))
+        output.append(f"# HELP {name} {help_text}")
+        output.append(f"# TYPE {name} {metric_type}")
+        output.extend(samples[name])
+    return "\n".join(output) + "\n"
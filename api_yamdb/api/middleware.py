@@ -0,0 +1,140 @@
+import time
+
+from django.conf import settings
+from django.db import connection
+from rest_framework.permissions import SAFE_METHODS
+
+from .instrumentation import QueryRecorder, request_stats
+from .metrics import registry
+from .replicas import (
+    end_routing,
+    pin_to_primary,
+    replicas_enabled,
+    start_routing,
+)
+
+
+def get_view_name(request, view_func):
+    """Возвращает имя view и действия, например TitleViewSet.list."""
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return getattr(view_func, "__name__", "unknown")
+    method = request.method.lower()
+    actions = getattr(view_func, "actions", None) or {}
+    return f"{view_class.__name__}.{actions.get(method, method)}"
+
+
+class RequestTimingMiddleware:
+    """
+    Middleware, измеряющий для каждого запроса число SQL-запросов,
+    время в базе данных, время сериализации и общее время.
+
+    Время сериализации - это время работы view за вычетом SQL
+    (до рендеринга ответа), для DRF-view его основную часть составляет
+    to_representation сериализаторов. Результат накапливается
+    в request_stats по имени view, попадает в метрики Prometheus
+    (api.metrics) и при включенной настройке SERVER_TIMING
+    отдается в заголовке Server-Timing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        recorder = QueryRecorder()
+        request.timing = {"view": None, "recorder": recorder}
+        connection_open = connection.connection is not None
+        with recorder.record():
+            response = self.get_response(request)
+        total_time = time.perf_counter() - started
+
+        timing = request.timing
+        serializer_time = 0.0
+        if "view_started" in timing:
+            view_finished = timing.get("view_finished", time.perf_counter())
+            view_db_time = timing.get("view_db_time", recorder.db_time)
+            serializer_time = max(
+                view_finished
+                - timing["view_started"]
+                - (view_db_time - timing["view_db_started"]),
+                0.0,
+            )
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = ", ".join(
+                (
+                    f'db;dur={recorder.db_time * 1000:.2f};'
+                    f'desc="{recorder.queries} queries"',
+                    f"serializer;dur={serializer_time * 1000:.2f}",
+                    f"total;dur={total_time * 1000:.2f}",
+                )
+            )
+        if timing["view"] is not None:
+            request_stats.add(
+                timing["view"],
+                recorder.queries,
+                recorder.db_time,
+                serializer_time,
+                total_time,
+            )
+        self.record_metrics(
+            request, response, recorder, total_time, connection_open
+        )
+        return response
+
+    def record_metrics(
+        self, request, response, recorder, total_time, connection_open
+    ):
+        view = request.timing["view"] or "unresolved"
+        registry.inc(
+            "yamdb_http_requests_total",
+            view=view,
+            method=request.method,
+            status=response.status_code,
+        )
+        registry.observe(
+            "yamdb_http_request_duration_seconds", total_time, view=view
+        )
+        if recorder.queries:
+            registry.inc("yamdb_db_queries_total", recorder.queries, view=view)
+            if connection_open:
+                registry.inc("yamdb_db_connections_reused_total")
+        registry.maybe_flush()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = request.timing
+        timing["view"] = get_view_name(request, view_func)
+        timing["view_db_started"] = timing["recorder"].db_time
+        timing["view_started"] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # вызывается после view, но до рендеринга ответа
+        request.timing["view_finished"] = time.perf_counter()
+        request.timing["view_db_time"] = request.timing["recorder"].db_time
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware, разрешающий безопасным запросам читать с реплик
+    (api.replicas.ReplicaRouter). После успешного изменяющего запроса
+    чтения того же пользователя закрепляются за основной базой,
+    чтобы он сразу видел свои отзывы и комментарии.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = start_routing(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            end_routing(token)
+        if (
+            replicas_enabled()
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            pin_to_primary(request)
+        return response
@@ -1,7 +1,13 @@
 from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.mixins import CreateModelMixin
 from rest_framework.response import Response
 
+from .permissions import IsAdminUser
+from .serializers import BulkRequestSerializer
+from .utils import get_requested_fields
+
 
 class CreateModelHTTP200Mixin(CreateModelMixin):
     """
@@ -17,3 +23,98 @@ class CreateModelHTTP200Mixin(CreateModelMixin):
         return Response(
             serializer.data, status=status.HTTP_200_OK, headers=headers
         )
+
+
+class SparseFieldsetMixin:
+    """
+    Mixin ViewSet для параметра ?fields=: колонки и связи, не нужные
+    запрошенным полям, убираются из SELECT и prefetch_related.
+
+    sparse_fields - поле ответа -> колонки модели для only(), связи
+    с "__" загружаются через select_related; sparse_prefetch - поле
+    ответа -> связь для prefetch_related; sparse_required_fields -
+    колонки, нужные view независимо от запроса. Поля сортировки
+    курсорной пагинации (cursor_ordering) загружаются всегда.
+    """
+
+    fields_query_param = "fields"
+    sparse_fields = {}
+    sparse_prefetch = {}
+    sparse_required_fields = ()
+
+    def get_sparse_fields(self):
+        requested = get_requested_fields(
+            self.request, self.fields_query_param
+        )
+        if requested is None:
+            return None
+        unknown = requested - set(self.sparse_fields) - set(
+            self.sparse_prefetch
+        )
+        if unknown:
+            raise ValidationError(
+                {
+                    self.fields_query_param: [
+                        f"Неизвестные поля: {', '.join(sorted(unknown))}"
+                    ]
+                }
+            )
+        return requested
+
+    def get_sparse_columns(self, requested):
+        columns = list(self.sparse_required_fields)
+        columns.extend(
+            field.lstrip("-") for field in getattr(self, "cursor_ordering", ())
+        )
+        for name in requested:
+            columns.extend(self.sparse_fields.get(name, ()))
+        return columns
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        requested = self.get_sparse_fields()
+        if requested is None:
+            return queryset
+        columns = self.get_sparse_columns(requested)
+        related = {
+            column.split("__")[0] for column in columns if "__" in column
+        }
+        prefetch = [
+            self.sparse_prefetch[name]
+            for name in requested
+            if name in self.sparse_prefetch
+        ]
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset.only(*columns)
+
+
+class BulkCreateMixin:
+    """
+    Mixin ViewSet с действием bulk (POST .../bulk/) для администратора:
+    массовое создание или обновление (upsert) объектов через
+    bulk_writer_class (api.bulk). Ответ содержит результат по каждому
+    элементу; в режиме atomic при ошибках возвращается 400
+    и ничего не сохраняется.
+    """
+
+    bulk_writer_class = None
+
+    @action(detail=False, methods=["post"], permission_classes=(IsAdminUser,))
+    def bulk(self, request):
+        serializer = BulkRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        writer = self.bulk_writer_class(upsert=data["upsert"])
+        objects = writer.validate(data["items"])
+        atomic = data["mode"] == BulkRequestSerializer.ATOMIC
+        if writer.has_errors and atomic:
+            return Response(
+                writer.report(), status=status.HTTP_400_BAD_REQUEST
+            )
+        if objects:
+            writer.save(objects)
+        return Response(writer.report(), status=status.HTTP_200_OK)
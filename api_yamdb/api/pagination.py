@@ -0,0 +1,57 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация по полям сортировки представления.
+    Порядок берется из атрибута cursor_ordering у ViewSet.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = settings.MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, "cursor_ordering", self.ordering)
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    """
+    Пагинация по номерам страниц с опциональным курсорным режимом.
+    Курсорный режим включается параметром ?pagination=cursor,
+    ссылки next/previous в этом режиме содержат параметр cursor.
+    Размер страницы задается параметром ?page_size= и в обоих режимах
+    ограничен настройкой MAX_PAGE_SIZE.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = settings.MAX_PAGE_SIZE
+
+    mode_query_param = "pagination"
+    cursor_mode = "cursor"
+    cursor_paginator_class = KeysetCursorPagination
+
+    cursor_paginator = None
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+            or self.cursor_paginator_class.cursor_query_param
+            in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if view is not None and hasattr(view, "cursor_ordering"):
+            if self.use_cursor(request):
+                self.cursor_paginator = self.cursor_paginator_class()
+                return self.cursor_paginator.paginate_queryset(
+                    queryset, request, view
+                )
+        self.cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
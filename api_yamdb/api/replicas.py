@@ -0,0 +1,111 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+PIN_KEY = "db:primary-pin:{}"
+
+_routing = ContextVar("replica_routing", default=None)
+
+
+def replicas_enabled():
+    """
+    Проверяет, можно ли читать с реплик. Закрепление за основной базой
+    хранится в кеше и должно быть видно всем процессам (CACHE_SHARED),
+    иначе запрос, попавший в другой воркер, не увидел бы свою запись.
+    """
+    return bool(settings.DATABASE_REPLICAS) and settings.CACHE_SHARED
+
+
+def get_pin_key(request):
+    """
+    Ключ закрепления за основной базой: по id пользователя,
+    для анонимных запросов - по IP-адресу клиента, за прокси -
+    из X-Forwarded-For с учетом NUM_PROXIES, как у throttle.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return PIN_KEY.format(f"user:{user.pk}")
+    return PIN_KEY.format(f"ip:{BaseThrottle().get_ident(request)}")
+
+
+def pin_to_primary(request):
+    """Направляет чтения автора записи в основную базу на время окна."""
+    cache.set(
+        get_pin_key(request), True, settings.DATABASE_REPLICA_STICKY_SECONDS
+    )
+
+
+class ReplicaRouting:
+    """
+    Состояние маршрутизации одного безопасного запроса.
+    Закрепление проверяется при первом чтении, то есть после
+    аутентификации DRF, реплика выбирается одна на весь запрос.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.alias = None
+        self._pinned = None
+
+    def get_alias(self):
+        if self._pinned is None:
+            self._pinned = bool(cache.get(get_pin_key(self.request)))
+            if not self._pinned:
+                self.alias = random.choice(settings.DATABASE_REPLICAS)
+        return self.alias
+
+
+def start_routing(request):
+    """
+    Разрешает чтение с реплик до вызова end_routing,
+    если метод запроса безопасный и реплики включены.
+    """
+    routing = None
+    if request.method in SAFE_METHODS and replicas_enabled():
+        routing = ReplicaRouting(request)
+    return _routing.set(routing)
+
+
+def end_routing(token):
+    _routing.reset(token)
+
+
+def read_from_replica():
+    """Проверяет, читал ли текущий запрос данные с реплики."""
+    routing = _routing.get()
+    return routing is not None and routing.alias is not None
+
+
+class ReplicaRouter:
+    """
+    Router базы данных: чтения моделей replicated_apps в безопасных
+    запросах API идут на реплики DATABASE_REPLICAS, остальные чтения
+    и все записи - в основную базу. Чтения внутри transaction.atomic
+    и чтения пользователя, недавно изменявшего данные
+    (pin_to_primary), тоже остаются в основной базе. Без общего кеша
+    реплики не используются (replicas_enabled).
+    """
+
+    replicated_apps = ("reviews",)
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if (
+            routing is None
+            or model._meta.app_label not in self.replicated_apps
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return routing.get_alias() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        return obj1._state.db in databases and obj2._state.db in databases
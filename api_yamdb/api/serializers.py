@@ -1,16 +1,179 @@
 from datetime import datetime
+from operator import attrgetter
 
-from django.db import IntegrityError
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, models
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.fields import Field, SkipField
+from rest_framework.relations import PKOnlyObject
 from rest_framework.validators import UniqueTogetherValidator
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
 
-from .utils import CurrentTitleModelObjDefault
+from .slugs import category_slugs, genre_slugs
+from .utils import CurrentTitleModelObjDefault, get_requested_fields
 
 
-class CommentSerializer(serializers.ModelSerializer):
+def _is_plain_attribute(model, source):
+    """Проверяет, что source - поле или свойство модели, а не метод."""
+    try:
+        model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return isinstance(getattr(model, source, None), property)
+    return True
+
+
+def _get_fallback_attribute(field):
+    def get_attribute(instance):
+        attribute = field.get_attribute(instance)
+        if isinstance(attribute, PKOnlyObject) and attribute.pk is None:
+            return None
+        return attribute
+
+    return get_attribute
+
+
+def _get_many_attribute(model, source):
+    """
+    Читает прямую связь many-to-many из кеша prefetch_related,
+    не создавая менеджер связи для каждого объекта.
+    """
+    if not isinstance(model._meta.get_field(source), models.ManyToManyField):
+        return attrgetter(source)
+    get_manager = attrgetter(source)
+
+    def get_attribute(instance):
+        prefetched = getattr(instance, "_prefetched_objects_cache", {})
+        if source in prefetched:
+            return prefetched[source]
+        return get_manager(instance)
+
+    return get_attribute
+
+
+def _compile_field(field, model):
+    """
+    Возвращает функцию чтения атрибута и функцию представления поля.
+    Простые поля и поля связей читаются через attrgetter, вложенные
+    сериализаторы компилируются рекурсивно, остальные поля используют
+    стандартные get_attribute и to_representation.
+    """
+    plain = (
+        len(field.source_attrs) == 1
+        and _is_plain_attribute(model, field.source)
+    )
+    if (
+        plain
+        and isinstance(field, serializers.ListSerializer)
+        and isinstance(field.child, serializers.ModelSerializer)
+    ):
+        child = compile_serializer(field.child)
+        return _get_many_attribute(model, field.source), lambda value: [
+            child(item)
+            for item in (
+                value.all() if isinstance(value, models.Manager) else value
+            )
+        ]
+    if plain and isinstance(field, serializers.ModelSerializer):
+        return attrgetter(field.source), compile_serializer(field)
+    if plain and isinstance(field, serializers.SlugRelatedField):
+        return attrgetter(field.source), attrgetter(field.slug_field)
+    if (
+        plain
+        and type(field).get_attribute is Field.get_attribute
+        and not isinstance(field, serializers.RelatedField)
+    ):
+        return attrgetter(field.source), field.to_representation
+    return _get_fallback_attribute(field), field.to_representation
+
+
+def compile_serializer(serializer):
+    """
+    Компилирует сериализатор модели в функцию instance -> dict.
+    Результат совпадает с serializer.to_representation, но без
+    обхода полей и обработки исключений DRF для каждого объекта.
+    """
+    model = serializer.Meta.model
+    accessors = [
+        (field.field_name,) + _compile_field(field, model)
+        for field in serializer.fields.values()
+        if not field.write_only
+    ]
+
+    def to_representation(instance):
+        ret = {}
+        for name, get_attribute, represent in accessors:
+            try:
+                attribute = get_attribute(instance)
+            except SkipField:
+                continue
+            ret[name] = None if attribute is None else represent(attribute)
+        return ret
+
+    return to_representation
+
+
+class FastListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer для чтения списков, использующий скомпилированный
+    сериализатор (compile_serializer): поля разбираются один раз на
+    список, а не для каждого объекта. Подключается через
+    Meta.list_serializer_class, запись идет стандартным путем.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        to_representation = compile_serializer(self.child)
+        return [to_representation(item) for item in iterable]
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField, который ищет объект в процессном справочнике
+    slug_map (api.slugs) вместо запроса к базе. Объект содержит
+    только поля id, slug и name. queryset используется лишь
+    для выбора значений в browsable API.
+    """
+
+    def __init__(self, slug_map, **kwargs):
+        self.slug_map = slug_map
+        super().__init__(slug_field="slug", **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (str, int)) or isinstance(data, bool):
+            self.fail("invalid")
+        obj = self.slug_map.get_object(str(data))
+        if obj is None:
+            self.fail(
+                "does_not_exist", slug_name=self.slug_field, value=str(data)
+            )
+        return obj
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Mixin сериализатора, оставляющий при чтении только поля из
+    параметра ?fields=. Для списков поля убираются у дочернего
+    сериализатора, поэтому FastListSerializer компилирует только их.
+    """
+
+    fields_query_param = "fields"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = get_requested_fields(
+            self.context.get("request"), self.fields_query_param
+        )
+        if requested is not None:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+
+class CommentSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор модели Comment."""
 
     author = serializers.SlugRelatedField(
@@ -18,11 +181,14 @@ class CommentSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        exclude = ("review",)
+        exclude = ("review", "updated_at")
         model = Comment
+        list_serializer_class = FastListSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор модели Review."""
 
     author = serializers.SlugRelatedField(
@@ -33,41 +199,58 @@ class ReviewSerializer(serializers.ModelSerializer):
     title = serializers.HiddenField(default=CurrentTitleModelObjDefault())
 
     class Meta:
-        fields = "__all__"
+        exclude = ("updated_at",)
         model = Review
-        validators = (
-            UniqueTogetherValidator(
-                queryset=Review.objects.all(),
-                fields=("title", "author"),
-                message="Вы уже оставляли отзыв на данное произведение!",
-            ),
-        )
+        list_serializer_class = FastListSerializer
+        # уникальность пары title/author проверяет ограничение unique_review
+        validators = ()
+
+
+class ReservedSlugMixin:
+    """
+    Mixin сериализатора категорий и жанров. Их адрес строится по slug,
+    поэтому slug не может совпадать с путем действия списка ViewSet
+    (BulkCreateMixin.bulk), иначе объект стал бы недоступен.
+    """
+
+    reserved_slugs = ("bulk",)
 
+    def validate_slug(self, value):
+        if value in self.reserved_slugs:
+            raise ValidationError(
+                f"Нельзя использовать '{value}' в качестве slug!"
+            )
+        return value
 
-class CategorySerializer(serializers.ModelSerializer):
+
+class CategorySerializer(ReservedSlugMixin, serializers.ModelSerializer):
     """Сериализатор модели Category."""
 
     class Meta:
         fields = ("name", "slug")
         model = Category
+        list_serializer_class = FastListSerializer
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(ReservedSlugMixin, serializers.ModelSerializer):
     """Сериализатор для модели Genre."""
 
     class Meta:
         fields = ("name", "slug")
         model = Genre
+        list_serializer_class = FastListSerializer
 
 
-class TitleSerializerRead(serializers.ModelSerializer):
+class TitleSerializerRead(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """
     Сериализатор модели Title, предоставляющий данные для чтения.
     """
 
     genre = GenreSerializer(read_only=True, many=True)
     category = CategorySerializer(read_only=True)
-    rating = serializers.FloatField()
+    rating = serializers.FloatField(read_only=True)
 
     class Meta:
         fields = (
@@ -80,6 +263,7 @@ class TitleSerializerRead(serializers.ModelSerializer):
             "category",
         )
         model = Title
+        list_serializer_class = FastListSerializer
 
 
 class TitleSerializerWrite(serializers.ModelSerializer):
@@ -87,15 +271,15 @@ class TitleSerializerWrite(serializers.ModelSerializer):
     Сериализатор модели Title, берущий данные для записи.
     """
 
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(), slug_field="slug"
+    category = CachedSlugRelatedField(
+        category_slugs, queryset=Category.objects.all()
     )
-    genre = serializers.SlugRelatedField(
-        queryset=Genre.objects.all(), slug_field="slug", many=True
+    genre = CachedSlugRelatedField(
+        genre_slugs, queryset=Genre.objects.all(), many=True
     )
 
     class Meta:
-        fields = "__all__"
+        exclude = ("rating_sum", "rating_count", "updated_at")
         model = Title
         validators = (
             UniqueTogetherValidator(
@@ -111,6 +295,72 @@ class TitleSerializerWrite(serializers.ModelSerializer):
         return value
 
 
+class BulkCategorySerializer(CategorySerializer):
+    """
+    Сериализатор элемента массовой загрузки категорий.
+    Уникальность проверяется для всей пачки одним запросом.
+    """
+
+    class Meta(CategorySerializer.Meta):
+        extra_kwargs = {
+            "name": {"validators": []},
+            "slug": {"validators": []},
+        }
+
+
+class BulkGenreSerializer(GenreSerializer):
+    """
+    Сериализатор элемента массовой загрузки жанров.
+    Уникальность проверяется для всей пачки одним запросом.
+    """
+
+    class Meta(GenreSerializer.Meta):
+        extra_kwargs = {
+            "name": {"validators": []},
+            "slug": {"validators": []},
+        }
+
+
+class BulkTitleSerializer(TitleSerializerWrite):
+    """
+    Сериализатор элемента массовой загрузки произведений.
+    Слаги категории и жанров и уникальность произведения проверяются
+    для всей пачки сразу, поэтому здесь не обращаются к базе.
+    """
+
+    category = serializers.SlugField(
+        max_length=Category._meta.get_field("slug").max_length
+    )
+    genre = serializers.ListField(
+        child=serializers.SlugField(
+            max_length=Genre._meta.get_field("slug").max_length
+        )
+    )
+
+    class Meta(TitleSerializerWrite.Meta):
+        validators = ()
+
+
+class BulkRequestSerializer(serializers.Serializer):
+    """
+    Сериализатор запроса массовой загрузки. В режиме atomic
+    при любой ошибке ничего не сохраняется, в режиме partial
+    сохраняются элементы без ошибок. upsert обновляет
+    существующие объекты вместо ошибки уникальности.
+    """
+
+    ATOMIC = "atomic"
+    PARTIAL = "partial"
+
+    items = serializers.ListField(
+        child=serializers.JSONField(),
+        allow_empty=False,
+        max_length=settings.BULK_MAX_ITEMS,
+    )
+    mode = serializers.ChoiceField((ATOMIC, PARTIAL), default=ATOMIC)
+    upsert = serializers.BooleanField(default=False)
+
+
 class SignUpSerializer(serializers.Serializer):
     """Сериализатор для регистрации пользователей."""
 
@@ -144,7 +394,9 @@ class CustomTokenSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField(max_length=24)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор модели User."""
 
     class Meta:
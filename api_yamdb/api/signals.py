@@ -0,0 +1,86 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+from users.signals import users_updated
+
+from . import cache, conditional
+from .authentication import (
+    forget_user_states,
+    revoke_user_tokens,
+    store_user_state,
+)
+from .metrics import registry
+from .slugs import SLUG_MAPS
+
+CACHED_MODELS = (Title, Genre, Category, Review, Comment)
+
+
+def get_changed_collections(instance):
+    """Возвращает коллекции API, содержимое которых зависит от объекта."""
+    if isinstance(instance, Title):
+        return ("titles", f"reviews:{instance.pk}")
+    if isinstance(instance, Review):
+        return (
+            "titles",
+            f"reviews:{instance.title_id}",
+            f"comments:{instance.pk}",
+        )
+    if isinstance(instance, Comment):
+        return (f"comments:{instance.review_id}",)
+    return ("titles",)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_response_cache(sender, instance, **kwargs):
+    """
+    Сбрасывает кеш ответов при изменении публичных данных.
+    Сброс выполняется после фиксации транзакции записи.
+    """
+    if sender in CACHED_MODELS:
+        cache.invalidate()
+        conditional.touch(*get_changed_collections(instance))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_slug_map(sender, **kwargs):
+    """Сбрасывает справочник слагов категорий или жанров."""
+    if sender in SLUG_MAPS:
+        SLUG_MAPS[sender].invalidate()
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_response_cache_on_genres(sender, action, **kwargs):
+    """Сбрасывает кеш ответов при изменении жанров произведения."""
+    if action.startswith("post_"):
+        cache.invalidate()
+        conditional.touch("titles")
+
+
+@receiver(post_save, sender=User)
+def refresh_user_state(sender, instance, **kwargs):
+    """Обновляет данные пользователя, по которым проверяются токены."""
+    store_user_state(instance)
+
+
+@receiver(users_updated, sender=User)
+def forget_updated_user_states(sender, pks, **kwargs):
+    """Сбрасывает данные пользователей, измененных через QuerySet.update()."""
+    forget_user_states(pks)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    """Отзывает токены удаленного пользователя."""
+    revoke_user_tokens(instance.pk)
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    """Считает открытые соединения с базой данных."""
+    registry.inc(
+        "yamdb_db_connections_opened_total", database=connection.alias
+    )
@@ -0,0 +1,117 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from reviews.models import Category, Genre
+
+from .cache import get_cache
+
+
+class SlugMap:
+    """
+    Процессный кеш справочника slug -> (id, name) для небольших
+    и редко меняющихся моделей (категории, жанры).
+
+    Актуальность копии проверяется по версии в общем кеше: поиск
+    стоит одно обращение к кешу вместо запроса к базе. После изменения
+    справочника invalidate меняет версию, и каждый процесс один раз
+    перечитывает его целиком. Без общего кеша (CACHE_SHARED) другие
+    процессы не узнали бы о новой версии, поэтому slug ищется
+    запросом к базе.
+    """
+
+    field_names = ("id", "slug", "name")
+
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f"api:slugs:{model._meta.label_lower}"
+        self._state = (None, {})
+
+    def __deepcopy__(self, memo):
+        # поля сериализатора копируются при каждом создании
+        # сериализатора, справочник должен оставаться общим
+        return self
+
+    def get_version(self):
+        # случайная версия: если ключ вытеснят из кеша, процессы
+        # перечитают справочник, а не продолжат доверять старой копии
+        return get_cache().get_or_set(
+            self.version_key, uuid4().hex, timeout=None
+        )
+
+    def get_items(self):
+        version = self.get_version()
+        cached_version, items = self._state
+        if version != cached_version:
+            # справочник читается из основной базы: реплика может
+            # еще не содержать изменение, по которому сменилась версия
+            items = {
+                slug: (pk, name)
+                for pk, slug, name in self.model.objects.using(
+                    DEFAULT_DB_ALIAS
+                ).values_list(*self.field_names)
+            }
+            self._state = (version, items)
+        return items
+
+    def get_item(self, slug):
+        """Возвращает пару (id, name) по slug или None."""
+        if not settings.CACHE_SHARED:
+            return (
+                self.model.objects.using(DEFAULT_DB_ALIAS)
+                .filter(slug=slug)
+                .values_list("id", "name")
+                .first()
+            )
+        return self.get_items().get(slug)
+
+    def get_id(self, slug):
+        """Возвращает id объекта по slug или None."""
+        item = self.get_item(slug)
+        return None if item is None else item[0]
+
+    def get_lookup(self, field_name, slug):
+        """
+        Возвращает условие queryset.filter по slug связанного объекта
+        или None, если slug не найден. С общим кешем условие строится
+        по id из справочника, без него - по slug через JOIN в том же
+        запросе, чтобы фильтр не стоил отдельного запроса к базе.
+        """
+        if not settings.CACHE_SHARED:
+            return {f"{field_name}__slug": slug}
+        pk = self.get_id(slug)
+        return None if pk is None else {f"{field_name}_id": pk}
+
+    def get_object(self, slug):
+        """
+        Возвращает объект модели с полями id, slug и name
+        (с общим кешем - без запроса к базе) или None,
+        если slug не найден.
+        """
+        item = self.get_item(slug)
+        if item is None:
+            return None
+        pk, name = item
+        return self.model.from_db(
+            DEFAULT_DB_ALIAS, self.field_names, (pk, slug, name)
+        )
+
+    def invalidate(self):
+        """Меняет версию справочника после фиксации транзакции."""
+        transaction.on_commit(
+            lambda: get_cache().set(
+                self.version_key, uuid4().hex, timeout=None
+            )
+        )
+
+
+category_slugs = SlugMap(Category)
+genre_slugs = SlugMap(Genre)
+
+SLUG_MAPS = {Category: category_slugs, Genre: genre_slugs}
+
+
+def invalidate_all():
+    """Сбрасывает все справочники, например после массовой загрузки."""
+    for slug_map in SLUG_MAPS.values():
+        slug_map.invalidate()
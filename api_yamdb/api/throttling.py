@@ -0,0 +1,142 @@
+import time
+from functools import lru_cache
+
+from django.core.cache import cache as default_cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import registry
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """
+    Разбирает частоту вида "10/min" в пару (емкость корзины, период
+    в секундах). Пустая частота отключает ограничение.
+    """
+    if not rate:
+        return None, None
+    number, period = rate.split("/")
+    return int(number), PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle на алгоритме token bucket, состояние корзин хранится
+    в кеше по умолчанию. С общим кешем (CACHE_SHARED, Redis
+    в docker-compose) лимит действует на все процессы, с локальным
+    кешем процесса у каждого процесса свои корзины.
+
+    Корзина частоты N/период вмещает N токенов и равномерно пополняется
+    за период: допускается всплеск до N запросов, а в среднем не больше
+    N за период. Проверка - одно чтение и одна запись ключа кеша;
+    как и у throttle DRF, гонка между процессами может пропустить
+    лишний запрос, но не отклонить разрешенный.
+    Частота scope берется из DEFAULT_THROTTLE_RATES.
+    """
+
+    cache = default_cache
+    cache_format = "throttle:{scope}:{ident}"
+    scope = None
+    rate = None
+    timer = time.time
+
+    def __init__(self):
+        self.wait_time = None
+
+    def get_scope(self, request, view):
+        return self.scope
+
+    def get_rate(self, scope):
+        if self.rate is not None:
+            return self.rate
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"Не задана частота запросов для scope '{scope}'"
+            )
+
+    def get_cache_ident(self, request, view):
+        """Возвращает идентификатор клиента, которому принадлежит корзина."""
+        raise NotImplementedError(".get_cache_ident() must be overridden")
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        if scope is None:
+            return True
+        capacity, period = parse_rate(self.get_rate(scope))
+        if capacity is None:
+            return True
+        key = self.cache_format.format(
+            scope=scope, ident=self.get_cache_ident(request, view)
+        )
+        now = self.timer()
+        tokens, updated = self.cache.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + (now - updated) * capacity / period)
+        allowed = tokens >= 1
+        if allowed:
+            # через period секунд пустая корзина снова полна
+            self.cache.set(key, (tokens - 1, now), period)
+        else:
+            self.wait_time = (1 - tokens) * period / capacity
+        registry.inc(
+            "yamdb_throttle_requests_total",
+            scope=scope,
+            result="allowed" if allowed else "throttled",
+        )
+        return allowed
+
+    def wait(self):
+        return self.wait_time
+
+
+class AuthRateThrottle(TokenBucketThrottle):
+    """
+    Ограничивает регистрацию и получение токена по IP-адресу клиента:
+    каждый запрос генерирует код подтверждения и ставит письмо в очередь.
+    Адрес за прокси берется из X-Forwarded-For с учетом NUM_PROXIES.
+    """
+
+    scope = "auth"
+
+    def get_cache_ident(self, request, view):
+        return self.get_ident(request)
+
+
+class ReadRateThrottle(TokenBucketThrottle):
+    """
+    Ограничивает чтение: анонимные запросы - по IP-адресу (anon_read),
+    запросы пользователей - по id пользователя (user_read).
+    """
+
+    def get_scope(self, request, view):
+        if request.method not in SAFE_METHODS:
+            return None
+        if request.user.is_authenticated:
+            return "user_read"
+        return "anon_read"
+
+    def get_cache_ident(self, request, view):
+        if request.user.is_authenticated:
+            return request.user.pk
+        return self.get_ident(request)
+
+
+class CreateRateThrottle(TokenBucketThrottle):
+    """
+    Ограничивает создание объектов пользователем.
+    Scope задается атрибутом create_throttle_scope у view.
+    """
+
+    def get_scope(self, request, view):
+        if getattr(view, "action", None) != "create":
+            return None
+        return getattr(view, "create_throttle_scope", None)
+
+    def get_cache_ident(self, request, view):
+        return request.user.pk or self.get_ident(request)
@@ -2,10 +2,13 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
+    CacheStatsView,
     CategoryViewSet,
     CommentViewSet,
     CustomTokenView,
+    ExportView,
     GenreViewSet,
+    RequestStatsView,
     ReviewViewSet,
     SignUpView,
     TitleViewSet,
@@ -31,4 +34,11 @@ urlpatterns = [
     path("v1/", include(router_v1.urls)),
     path("v1/auth/signup/", SignUpView.as_view(), name="sign_up"),
     path("v1/auth/token/", CustomTokenView.as_view(), name="token_obtain"),
+    path("v1/cache/stats/", CacheStatsView.as_view(), name="cache_stats"),
+    path("v1/export/<str:dataset>/", ExportView.as_view(), name="export"),
+    path(
+        "v1/metrics/requests/",
+        RequestStatsView.as_view(),
+        name="request_stats",
+    ),
 ]
@@ -1,15 +1,30 @@
-from django.shortcuts import get_object_or_404
-from reviews.models import Title
+from rest_framework.permissions import SAFE_METHODS
 
 
 class CurrentTitleModelObjDefault:
-    """Класс для получения произведения по title_id."""
+    """
+    Класс для получения произведения по title_id.
+    Произведение берется из view, который запоминает его на время запроса.
+    """
 
     requires_context = True
 
     def __call__(self, serializer_field):
-        title_id = serializer_field.context["view"].kwargs.get("title_id")
-        return get_object_or_404(Title, id=title_id)
+        return serializer_field.context["view"].get_title()
 
     def __repr__(self):
         return "%s()" % self.__class__.__name__
+
+
+def get_requested_fields(request, query_param="fields"):
+    """
+    Возвращает множество полей из параметра ?fields=id,name
+    или None, если параметр не задан. Параметр учитывается
+    только для чтения: запись всегда использует все поля.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    value = request.query_params.get(query_param)
+    if not value:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()} or None
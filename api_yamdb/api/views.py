@@ -3,21 +3,33 @@ from django.conf import settings
 from django.contrib.auth.tokens import (
     default_token_generator as code_generator,
 )
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.crypto import constant_time_compare
+from django.utils.dateparse import parse_date, parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.tokens import AccessToken
-from reviews.models import Category, Genre, Review, Title
-from users.models import User
-
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import OutboxEmail, User
+
+from .authentication import get_access_token
+from .bulk import CategoryBulkWriter, GenreBulkWriter, TitleBulkWriter
+from .cache import CachedListMixin, get_stats
+from .conditional import ConditionalGetMixin
+from .export import DATASETS, RENDERERS, export_rows
+from .instrumentation import query_budget, request_stats
+from .metrics import registry, render
+from .mixins import BulkCreateMixin, SparseFieldsetMixin
 from .permissions import (
     IsAdminOrReadOnly,
     IsAdminUser,
@@ -35,50 +47,121 @@ from .serializers import (
     TitleSerializerWrite,
     UserSerializer,
 )
+from .throttling import (
+    AuthRateThrottle,
+    CreateRateThrottle,
+    ReadRateThrottle,
+)
 from .viewsets import CreateListDestroyViewSet
 
 
-class CommentViewSet(ModelViewSet):
+@query_budget(list=3, retrieve=1)
+class CommentViewSet(SparseFieldsetMixin, ConditionalGetMixin, ModelViewSet):
     """
     ViewSet, поддерживающий стандартные действия для модели Comment.
     """
 
     serializer_class = CommentSerializer
     permission_classes = (IsStaffOrAuthorOrReadOnly,)
+    throttle_classes = (ReadRateThrottle, CreateRateThrottle)
+    create_throttle_scope = "comments"
+    cursor_ordering = ("-pub_date", "-id")
+    sparse_fields = {
+        "id": ("id",),
+        "text": ("text",),
+        "author": ("author__username",),
+        "pub_date": ("pub_date",),
+    }
+    sparse_required_fields = ("updated_at", "review_id")
+    stamp_collection = "comments:{review_id}"
 
     def get_review(self):
-        """Метод получения объекта ревью по review_id из url."""
-        return get_object_or_404(Review, id=self.kwargs["review_id"])
+        """
+        Метод получения объекта ревью по review_id и title_id из url.
+        Один запрос проверяет, что ревью относится к произведению,
+        результат запоминается до конца запроса.
+        """
+        if not hasattr(self, "_review"):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs["review_id"],
+                title_id=self.kwargs["title_id"],
+            )
+        return self._review
 
     def get_queryset(self):
-        review = self.get_review()
-        return review.comments.select_related("author")
+        if self.detail:
+            return Comment.objects.filter(
+                review_id=self.kwargs["review_id"],
+                review__title_id=self.kwargs["title_id"],
+            ).select_related("author")
+        return self.get_review().comments.select_related("author")
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
 
 
-class ReviewViewSet(ModelViewSet):
+@query_budget(list=3, retrieve=1)
+class ReviewViewSet(
+    SparseFieldsetMixin, ConditionalGetMixin, CachedListMixin, ModelViewSet
+):
     """
     ViewSet, поддерживающий стандартные действия для модели Review.
     """
 
     serializer_class = ReviewSerializer
     permission_classes = (IsStaffOrAuthorOrReadOnly,)
+    throttle_classes = (ReadRateThrottle, CreateRateThrottle)
+    create_throttle_scope = "reviews"
+    cursor_ordering = ("-pub_date", "-id")
+    sparse_fields = {
+        "id": ("id",),
+        "text": ("text",),
+        "author": ("author__username",),
+        "score": ("score",),
+        "pub_date": ("pub_date",),
+    }
+    sparse_required_fields = ("updated_at", "title_id")
+    stamp_collection = "reviews:{title_id}"
 
     def get_title(self):
-        """Метод получения объекта произведения по title_id из url."""
-        return get_object_or_404(Title, id=self.kwargs["title_id"])
+        """
+        Метод получения объекта произведения по title_id из url.
+        Результат запоминается до конца запроса.
+        """
+        if not hasattr(self, "_title"):
+            self._title = get_object_or_404(Title, id=self.kwargs["title_id"])
+        return self._title
 
     def get_queryset(self):
-        title = self.get_title()
-        return title.reviews.select_related("author")
+        if self.detail:
+            return Review.objects.filter(
+                title_id=self.kwargs["title_id"]
+            ).select_related("author")
+        return self.get_title().reviews.select_related("author")
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
-
-
-class CategoryViewSet(CreateListDestroyViewSet):
+        """
+        Уникальность отзыва проверяется ограничением unique_review в базе
+        данных вместо отдельного запроса валидатора.
+        """
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user)
+        except IntegrityError:
+            raise ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        "Вы уже оставляли отзыв на данное произведение!"
+                    ]
+                }
+            )
+
+
+@query_budget(list=2)
+class CategoryViewSet(
+    BulkCreateMixin, CachedListMixin, CreateListDestroyViewSet
+):
     """
     ViewSet, поддерживающий ограниченный набор действия для модели Category.
     Позволяет получить список категорий, создать или удалить категорию.
@@ -86,13 +169,15 @@ class CategoryViewSet(CreateListDestroyViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    bulk_writer_class = CategoryBulkWriter
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (SearchFilter,)
     search_fields = ("name",)
     lookup_field = "slug"
 
 
-class GenreViewSet(CreateListDestroyViewSet):
+@query_budget(list=2)
+class GenreViewSet(BulkCreateMixin, CachedListMixin, CreateListDestroyViewSet):
     """
     ViewSet, поддерживающий ограниченный набор действия для модели Genre.
     Позволяет получить список жанров, создать или удалить жанр.
@@ -100,25 +185,54 @@ class GenreViewSet(CreateListDestroyViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    bulk_writer_class = GenreBulkWriter
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (SearchFilter,)
     search_fields = ("name",)
     lookup_field = "slug"
 
 
-class TitleViewSet(ModelViewSet):
+@query_budget(list=3, retrieve=2)
+class TitleViewSet(
+    BulkCreateMixin,
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    ModelViewSet,
+):
     """
     ViewSet, поддерживающий стандартные действия для модели Title.
+
+    Страница списка стоит ровно 3 запроса независимо от ее размера
+    и фильтров: COUNT, выборка произведений с категорией через JOIN
+    и один запрос за жанрами всей страницы. Слаги фильтров category
+    и genre не требуют отдельных запросов ни с общим кешем, ни без
+    него (TitleFilter). Рейтинг хранится в Title, поэтому фильтры
+    не влияют на его расчет. Если в ?fields= нет
+    category или genre, JOIN или запрос за жанрами не выполняется.
     """
 
     queryset = (
-        Title.objects.prefetch_related("category", "genre")
-        .annotate(rating=Avg("reviews__score"))
+        Title.objects.select_related("category")
+        .prefetch_related("genre")
         .order_by("id")
     )
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    cursor_ordering = ("id",)
+    stamp_collection = "titles"
+    sparse_fields = {
+        "id": ("id",),
+        "name": ("name",),
+        "year": ("year",),
+        "rating": ("rating_sum", "rating_count"),
+        "description": ("description",),
+        "category": ("category__name", "category__slug"),
+    }
+    sparse_prefetch = {"genre": "genre"}
+    bulk_writer_class = TitleBulkWriter
+    sparse_required_fields = ("updated_at",)
 
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
@@ -133,19 +247,26 @@ class SignUpView(APIView):
     """
 
     permission_classes = (AllowAny,)
+    throttle_classes = (AuthRateThrottle,)
 
     @classmethod
     def _send_confirmation_code_to_user_email(cls, user, confirmation_code):
-        """Метод для отправки кода подтверждения на почту пользователя."""
-        subject = settings.EMAIL_SUBJECT
-        message = f"{settings.EMAIL_MESSAGE} {confirmation_code}"
-        from_email = settings.FROM_EMAIL
-        user.email_user(subject, message, from_email)
+        """
+        Метод для отправки кода подтверждения на почту пользователя.
+        Письмо ставится в очередь, отправляет его send_outbox_emails.
+        """
+        OutboxEmail.objects.create(
+            recipient=user.email,
+            subject=settings.EMAIL_SUBJECT,
+            message=f"{settings.EMAIL_MESSAGE} {confirmation_code}",
+            from_email=settings.FROM_EMAIL,
+        )
 
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
+        registry.inc("yamdb_signups_total")
 
         confirmation_code = code_generator.make_token(user)
         self._send_confirmation_code_to_user_email(user, confirmation_code)
@@ -159,6 +280,7 @@ class CustomTokenView(APIView):
     """
 
     permission_classes = (AllowAny,)
+    throttle_classes = (AuthRateThrottle,)
 
     def post(self, request):
         serializer = CustomTokenSerializer(data=request.data)
@@ -169,11 +291,11 @@ class CustomTokenView(APIView):
         user = get_object_or_404(User, username=username)
         if not code_generator.check_token(user=user, token=confirmation_code):
             raise ValidationError({"detail": "Неверный код подтвержения!"})
-        token = AccessToken.for_user(user)
+        token = get_access_token(user)
         return Response({"token": str(token)})
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(SparseFieldsetMixin, ModelViewSet):
     """
     ViewSet, поддерживающий стандартные действия для модели User.
     """
@@ -182,10 +304,17 @@ class UserViewSet(ModelViewSet):
     serializer_class = UserSerializer
     permission_classes = (IsAdminUser,)
     lookup_field = "username"
+    sparse_fields = {
+        name: (name,) for name in UserSerializer.Meta.fields
+    }
 
     def _get_request_user(self):
-        """Метод получения пользователя из объекта request."""
-        return self.request.user
+        """
+        Метод получения пользователя из объекта request.
+        Пользователь из токена содержит только claims,
+        поэтому полная запись загружается из базы данных.
+        """
+        return get_object_or_404(User, pk=self.request.user.pk)
 
     @action(
         detail=False,
@@ -202,3 +331,85 @@ class UserViewSet(ModelViewSet):
         if request.method == "GET":
             return self.retrieve(request)
         return self.partial_update(request)
+
+
+class CacheStatsView(APIView):
+    """
+    View, возвращающий счетчики попаданий и промахов кеша ответов.
+    Доступен только администратору.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(get_stats())
+
+
+class ExportView(APIView):
+    """
+    View для потоковой выгрузки произведений, отзывов и комментариев.
+    Доступен только администратору. Поддерживает форматы ndjson и csv
+    (?output=csv) и инкрементальную выгрузку (?since=2022-12-01).
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, dataset):
+        if dataset not in DATASETS:
+            raise NotFound(f"Неизвестный набор данных: {dataset}")
+        output = request.query_params.get("output", "ndjson")
+        if output not in RENDERERS:
+            raise ValidationError({"output": f"Неизвестный формат {output}"})
+        since = request.query_params.get("since")
+        if since is not None:
+            since = parse_datetime(since) or parse_date(since)
+            if since is None:
+                raise ValidationError({"since": "Неверный формат даты"})
+        renderer, content_type = RENDERERS[output]
+        response = StreamingHttpResponse(
+            renderer(*export_rows(dataset, since)), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{dataset}.{output}"'
+        )
+        return response
+
+
+class RequestStatsView(APIView):
+    """
+    View, возвращающий накопленную процессом статистику запросов по view:
+    число SQL-запросов, время в базе, время сериализации и общее время.
+    Доступен только администратору.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(request_stats.snapshot())
+
+
+def metrics_view(request):
+    """
+    Отдает метрики всех процессов в текстовом формате Prometheus.
+    Глубина очереди писем считается запросом к базе при каждом опросе.
+    """
+    if settings.METRICS_TOKEN and not constant_time_compare(
+        request.META.get("HTTP_AUTHORIZATION", ""),
+        f"Bearer {settings.METRICS_TOKEN}",
+    ):
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+    unsent = Q(sent_at__isnull=True)
+    failed = Q(attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS)
+    outbox = OutboxEmail.objects.aggregate(
+        pending=Count("id", filter=unsent & ~failed),
+        failed=Count("id", filter=unsent & failed),
+    )
+    return HttpResponse(
+        render(
+            {
+                "yamdb_email_outbox_pending": outbox["pending"],
+                "yamdb_email_outbox_failed": outbox["failed"],
+            }
+        ),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
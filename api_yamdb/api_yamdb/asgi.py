@@ -3,14 +3,59 @@ ASGI config for YaMDb project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
-For more information on this file, see
-https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+Django 2.2 has no native ASGI handler and no async views, so the WSGI
+handler is served through asgiref: request bodies are received and
+responses are sent by the event loop, while views run in a pool of
+ASGI_THREADS threads created on lifespan startup.
+
+Run with: gunicorn api_yamdb.asgi:application -k uvicorn.workers.UvicornWorker
 """
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-from django.core.asgi import get_asgi_application
+from asgiref.wsgi import WsgiToAsgi
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+
+class ThreadPoolApplication(WsgiToAsgi):
+    """
+    ASGI-приложение, выполняющее WSGI-обработчик Django в пуле потоков.
+    Пул создается при запуске сервера (lifespan), без поддержки lifespan
+    используется пул цикла событий по умолчанию.
+    """
+
+    def __init__(self, wsgi_application, threads):
+        super().__init__(wsgi_application)
+        self.threads = threads
+        self.executor = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        else:
+            await super().__call__(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.executor = ThreadPoolExecutor(
+                    self.threads, thread_name_prefix='django'
+                )
+                asyncio.get_event_loop().set_default_executor(self.executor)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.executor is not None:
+                    self.executor.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+application = ThreadPoolApplication(
+    get_wsgi_application(), settings.ASGI_THREADS
+)
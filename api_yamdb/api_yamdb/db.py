@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.dispatch import receiver
+
+# атрибут соединения: когда оно последний раз было заведомо рабочим
+CHECKED_AT = "yamdb_checked_at"
+
+
+@receiver(request_started)
+def check_connections_health(**kwargs):
+    """
+    Закрывает неработоспособные постоянные соединения с базой данных.
+    Соединение, оборванное сервером или pgbouncer между запросами,
+    переоткроется при первом обращении вместо ошибки в середине запроса.
+    Проверка стоит запроса к базе, поэтому проверяются только
+    соединения с ошибкой в прошлом запросе или простоявшие дольше
+    DB_CONN_HEALTH_CHECK_INTERVAL секунд.
+    """
+    if not settings.DB_CONN_HEALTH_CHECKS:
+        return
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        if (
+            not connection.errors_occurred
+            and now - getattr(connection, CHECKED_AT, 0)
+            < settings.DB_CONN_HEALTH_CHECK_INTERVAL
+        ):
+            continue
+        if connection.is_usable():
+            setattr(connection, CHECKED_AT, now)
+        else:
+            connection.close()
+
+
+@receiver(request_finished)
+def remember_connections_health(**kwargs):
+    """Отмечает соединения, с которыми запрос завершился без ошибок."""
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None or connection.errors_occurred:
+            continue
+        setattr(connection, CHECKED_AT, now)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
@@ -33,6 +34,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "api.middleware.RequestTimingMiddleware",
+    "api.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -72,10 +75,100 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', 'postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'postgres'),
         'HOST': os.getenv('DB_HOST', 'db'),
-        'PORT': os.getenv('DB_PORT', '5432')
+        'PORT': os.getenv('DB_PORT', '5432'),
+        # время жизни постоянного соединения в секундах,
+        # 0 - закрывать соединение после каждого запроса
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
     }
 }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['OPTIONS'] = {
+        'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+    }
+
+# Режим работы через pgbouncer с transaction pooling: серверные курсоры
+# не переживают границу транзакции, поэтому их нужно отключить.
+# Без них QuerySet.iterator() загружает весь результат в память,
+# поэтому выгрузка (api.export) читает таблицы пачками по id.
+# Часовой пояс сервера PostgreSQL должен совпадать с TIME_ZONE,
+# иначе Django будет выполнять SET TIME ZONE на уровне сессии.
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False').lower() in ('true', '1')
+if DB_PGBOUNCER:
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Проверка постоянных соединений перед обработкой запроса
+DB_CONN_HEALTH_CHECKS = (
+    os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() in ('true', '1')
+)
+# соединение проверяется, только если простояло без запросов дольше
+# этого числа секунд или в прошлом запросе с ним была ошибка
+DB_CONN_HEALTH_CHECK_INTERVAL = float(
+    os.getenv('DB_CONN_HEALTH_CHECK_INTERVAL', 30)
+)
+
+# Реплики только для чтения: DB_REPLICA_HOSTS - хосты PostgreSQL через
+# запятую, DB_REPLICA_NAMES - имена баз (например, файлы SQLite для
+# локальной проверки), по умолчанию совпадают с основной базой.
+# Безопасные запросы API читают произведения, отзывы и комментарии
+# с реплик (api.replicas.ReplicaRouter), после записи чтения автора
+# DB_REPLICA_STICKY_SECONDS секунд идут в основную базу. Закрепление
+# хранится в кеше, поэтому реплики используются только с общим кешем
+# (CACHE_SHARED), иначе все чтения идут в основную базу.
+# В тестах реплики зеркалируют основную базу.
+DB_REPLICA_HOSTS = [
+    host.strip() for host in os.getenv('DB_REPLICA_HOSTS', '').split(',')
+    if host.strip()
+]
+DB_REPLICA_NAMES = [
+    name.strip() for name in os.getenv('DB_REPLICA_NAMES', '').split(',')
+    if name.strip()
+]
+DATABASE_REPLICAS = []
+for number in range(max(len(DB_REPLICA_HOSTS), len(DB_REPLICA_NAMES))):
+    alias = f'replica{number + 1}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'OPTIONS': dict(DATABASES['default'].get('OPTIONS', {})),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if number < len(DB_REPLICA_HOSTS):
+        DATABASES[alias]['HOST'] = DB_REPLICA_HOSTS[number]
+    if number < len(DB_REPLICA_NAMES):
+        DATABASES[alias]['NAME'] = DB_REPLICA_NAMES[number]
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+DATABASE_REPLICA_STICKY_SECONDS = int(
+    os.getenv('DB_REPLICA_STICKY_SECONDS', 5)
+)
+
+
+# Cache
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+# Кеш виден всем процессам приложения. На нем держатся версия кеша ответов,
+# метки ETag, состояние пользователей для JWT, закрепление за основной
+# базой, корзины throttle и версия справочника слагов, поэтому несколько
+# воркеров gunicorn работают только с общим кешем (Redis в docker-compose).
+# Локальный кеш процесса (locmem) можно объявить общим, если приложение
+# работает в одном процессе.
+CACHE_SHARED = os.getenv(
+    "CACHE_SHARED",
+    str(
+        CACHES["default"]["BACKEND"]
+        != "django.core.cache.backends.locmem.LocMemCache"
+    ),
+).lower() in ("true", "1")
+
 
 # Password validation
 
@@ -132,12 +225,43 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.StatelessJWTAuthentication",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.PageNumberOrCursorPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # число прокси перед приложением (nginx в docker-compose): адрес
+    # клиента берется из X-Forwarded-For, добавленного последним прокси,
+    # значения, подставленные самим клиентом, не учитываются;
+    # 0 - приложение принимает соединения напрямую, берется REMOTE_ADDR
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 1)),
+    "DEFAULT_THROTTLE_CLASSES": [
+        "api.throttling.ReadRateThrottle",
+    ],
+    # частота в формате N/s|min|hour|day, пустое значение отключает лимит
+    "DEFAULT_THROTTLE_RATES": {
+        "auth": os.getenv("THROTTLE_AUTH_RATE", "10/min"),
+        "anon_read": os.getenv("THROTTLE_ANON_READ_RATE", "300/min"),
+        "user_read": os.getenv("THROTTLE_USER_READ_RATE", "1200/min"),
+        "reviews": os.getenv("THROTTLE_REVIEWS_RATE", "30/hour"),
+        "comments": os.getenv("THROTTLE_COMMENTS_RATE", "120/hour"),
+    },
 }
 
+# Наибольший размер страницы, который можно запросить параметром ?page_size=
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 100))
+
+# Наибольшее число элементов в одном запросе массовой загрузки (bulk)
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 1000))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
@@ -163,6 +287,14 @@ EMAIL_SUBJECT = "Сonfirmation code."
 EMAIL_MESSAGE = "You signed up for YaMDB. Your code is"
 FROM_EMAIL = "YaMDB"
 
+# Очередь исходящих писем (команда send_outbox_emails)
+
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv("EMAIL_OUTBOX_RETRY_DELAY", 30))
+EMAIL_OUTBOX_CLAIM_TIMEOUT = int(os.getenv("EMAIL_OUTBOX_CLAIM_TIMEOUT", 300))
+EMAIL_OUTBOX_POLL_INTERVAL = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL", 2))
+
 
 # Минимальная и максимальная оценки отзывов
 
@@ -173,3 +305,47 @@ REVIEW_MAX_SCORE = 10
 # формат datetime в csv
 
 CSV_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+# Кеш ответов публичных списков API
+
+API_RESPONSE_CACHE_ALIAS = "default"
+API_RESPONSE_CACHE_TIMEOUT = int(os.getenv("API_RESPONSE_CACHE_TIMEOUT", 300))
+
+
+# Размер пачки строк при потоковой выгрузке данных
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+
+
+# Проверка бюджета SQL-запросов view (декоратор api.instrumentation.query_budget),
+# включается в тестах
+
+QUERY_BUDGET_ENFORCE = (
+    os.getenv("QUERY_BUDGET_ENFORCE", "False").lower() in ("true", "1")
+)
+
+# Заголовок Server-Timing с числом и временем SQL-запросов в ответах API.
+# Раскрывает внутренние детали, поэтому по умолчанию выключен
+
+SERVER_TIMING = os.getenv("SERVER_TIMING", "False").lower() in ("true", "1")
+
+
+# Метрики Prometheus (/metrics). При нескольких процессах gunicorn каждый
+# воркер сохраняет свои метрики в METRICS_DIR, эндпоинт складывает их.
+# Пустой METRICS_DIR оставляет в ответе только метрики текущего процесса.
+# Если задан METRICS_TOKEN, эндпоинт требует заголовок
+# Authorization: Bearer <METRICS_TOKEN>. Снаружи /metrics закрыт
+# в nginx (infra/nginx/default.conf), Prometheus опрашивает web:8000.
+
+METRICS_DIR = os.getenv(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "yamdb_metrics")
+)
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 1))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+# Количество потоков, в которых ASGI-приложение (api_yamdb.asgi) выполняет
+# view; каждый поток держит свое постоянное соединение с базой данных
+
+ASGI_THREADS = int(os.getenv("ASGI_THREADS", 16))
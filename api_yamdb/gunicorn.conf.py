@@ -0,0 +1,125 @@
+"""
+Настройки gunicorn для продакшена: gunicorn -c gunicorn.conf.py.
+
+Количество воркеров и потоков считается по числу CPU и может быть
+переопределено переменными окружения GUNICORN_*. Класс воркера
+выбирается по настройкам пула соединений с базой данных: каждый
+одновременный запрос держит свое соединение, поэтому gevent с сотнями
+гринлетов включается только при работе через pgbouncer (DB_PGBOUNCER),
+в остальных случаях используются потоки (gthread).
+
+Несколько воркеров запускаются только с общим кешем (CACHE_SHARED):
+с локальным кешем процесса каждый воркер видел бы свои версии кеша
+ответов, отзывы токенов и лимиты запросов.
+"""
+
+import multiprocessing
+import os
+from importlib.util import find_spec
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def _env_bool(name, default="False"):
+    return os.getenv(name, default).lower() in ("true", "1")
+
+
+def _default_worker_class():
+    if (
+        _env_bool("DB_PGBOUNCER")
+        and find_spec("gevent") is not None
+        and find_spec("psycogreen") is not None
+    ):
+        return "gevent"
+    return "gthread"
+
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", _default_worker_class())
+workers = _env_int("GUNICORN_WORKERS", cpu_count * 2 + 1)
+# потоки используются только воркером gthread
+threads = _env_int("GUNICORN_THREADS", 4)
+# одновременные соединения на воркер gevent
+worker_connections = _env_int("GUNICORN_WORKER_CONNECTIONS", 100)
+
+# приложение загружается до fork: воркеры стартуют быстрее
+# и разделяют память с мастер-процессом
+preload_app = _env_bool("GUNICORN_PRELOAD", "True")
+
+# перезапуск воркера после max_requests запросов ограничивает рост памяти,
+# jitter не дает всем воркерам перезапуститься одновременно
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", None)
+errorlog = "-"
+
+
+def get_concurrency():
+    """Возвращает число запросов, одновременно обрабатываемых воркером."""
+    if worker_class == "gevent":
+        return worker_connections
+    if worker_class == "gthread":
+        return threads
+    if worker_class.startswith("uvicorn"):
+        return _env_int("ASGI_THREADS", 16)
+    return 1
+
+
+def on_starting(server):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
+    from api import metrics
+    from django.conf import settings
+
+    if workers > 1 and not settings.CACHE_SHARED:
+        raise RuntimeError(
+            f"Кеш {settings.CACHES['default']['BACKEND']} не общий для "
+            f"процессов, а воркеров {workers}: задайте CACHE_BACKEND "
+            "и CACHE_LOCATION общего кеша (например, Redis) "
+            "или GUNICORN_WORKERS=1."
+        )
+    metrics.clear()
+
+
+def post_fork(server, worker):
+    if worker_class == "gevent":
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
+
+
+def worker_exit(server, worker):
+    from api.metrics import registry
+
+    registry.flush()
+
+
+def child_exit(server, worker):
+    # снимок метрик завершившегося воркера переносится в архив,
+    # чтобы счетчики не уменьшались, а файлы не копились
+    from api.metrics import archive_process
+
+    archive_process(worker.pid)
+
+
+def when_ready(server):
+    concurrency = get_concurrency()
+    server.log.info(
+        "Воркеров: %s (%s), запросов на воркер: %s, всего одновременно: %s, "
+        "preload: %s, max_requests: %s±%s",
+        workers,
+        worker_class,
+        concurrency,
+        workers * concurrency,
+        preload_app,
+        max_requests,
+        max_requests_jitter,
+    )
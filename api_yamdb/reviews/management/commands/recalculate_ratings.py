@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from reviews.models import Review, Title
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает хранимый рейтинг всех произведений по отзывам."
+
+    def handle(self, *args, **options):
+        reviews = (
+            Review.objects.filter(title=OuterRef("pk"))
+            .order_by()
+            .values("title")
+        )
+        score_sum = reviews.annotate(value=Sum("score")).values("value")
+        score_count = reviews.annotate(value=Count("id")).values("value")
+        with transaction.atomic():
+            updated = Title.objects.update(
+                rating_sum=Coalesce(
+                    Subquery(score_sum, output_field=IntegerField()), 0
+                ),
+                rating_count=Coalesce(
+                    Subquery(score_count, output_field=IntegerField()), 0
+                ),
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Рейтинг пересчитан для {updated} произведений."
+            )
+        )
@@ -0,0 +1,71 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:31
+
+from django.db import DatabaseError, migrations, transaction
+
+TRIGRAM_INDEXES = (
+    ('title_name_trgm_idx', 'reviews_title'),
+    ('genre_name_trgm_idx', 'reviews_genre'),
+    ('category_name_trgm_idx', 'reviews_category'),
+)
+
+
+EXTENSION_ERROR = (
+    'Не удалось установить расширение pg_trgm: {error}\n'
+    'CREATE EXTENSION требует прав суперпользователя, а с PostgreSQL 13 - '
+    'прав владельца базы (pg_trgm - доверенное расширение). Выполните '
+    'от имени суперпользователя в базе {database}:\n'
+    '    CREATE EXTENSION IF NOT EXISTS pg_trgm;\n'
+    'и повторите migrate.'
+)
+
+
+def create_pg_trgm_extension(schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+        )
+        if cursor.fetchone():
+            return
+    try:
+        # точка сохранения: ошибка прав не прерывает транзакцию миграции
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError as error:
+        raise RuntimeError(
+            EXTENSION_ERROR.format(
+                error=str(error).strip(),
+                database=connection.settings_dict['NAME'],
+            )
+        ) from error
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # icontains на PostgreSQL превращается в UPPER("name"::text) LIKE ...,
+    # поэтому индекс строится по тому же выражению.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    create_pg_trgm_extension(schema_editor)
+    for name, table in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+            f'USING gin (UPPER((name)::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
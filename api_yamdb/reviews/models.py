@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 import datetime
 
 User = get_user_model()
@@ -41,6 +41,9 @@ class Title(models.Model):
         null=True,
     )
     genre = models.ManyToManyField(Genre)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
@@ -52,6 +55,17 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        """
+        Средняя оценка произведения.
+        Считается по хранимым сумме и количеству оценок,
+        которые поддерживаются сигналами модели Review.
+        """
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
 
 class Review(models.Model):
     """Модель отзывов по произведению."""
@@ -59,6 +73,7 @@ class Review(models.Model):
     text = models.TextField()
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     pub_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     title = models.ForeignKey(
         Title, on_delete=models.CASCADE, related_name="reviews"
     )
@@ -74,6 +89,20 @@ class Review(models.Model):
         default=settings.REVIEW_MIN_SCORE,
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._rating_snapshot = (
+            instance.__dict__.get("title_id"),
+            instance.__dict__.get("score"),
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        # рейтинг произведения обновляется в post_save в той же транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     @property
     def csv_pub_date(self):
         return self.pub_date
@@ -86,12 +115,22 @@ class Review(models.Model):
             )
 
     class Meta:
-        ordering = ("-pub_date",)
+        ordering = ("-pub_date", "-id")
         constraints = [
             models.UniqueConstraint(
                 fields=["title", "author"], name="unique_review"
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["title", "-pub_date", "-id"],
+                name="review_title_pub_date_idx",
+            ),
+            models.Index(
+                fields=["author", "-pub_date", "-id"],
+                name="review_author_pub_date_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.text
@@ -106,6 +145,7 @@ class Comment(models.Model):
     text = models.TextField()
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     pub_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def csv_pub_date(self):
@@ -119,7 +159,17 @@ class Comment(models.Model):
             )
 
     class Meta:
-        ordering = ("-pub_date",)
+        ordering = ("-pub_date", "-id")
+        indexes = [
+            models.Index(
+                fields=["review", "-pub_date", "-id"],
+                name="comment_review_pub_date_idx",
+            ),
+            models.Index(
+                fields=["author", "-pub_date", "-id"],
+                name="comment_author_pub_date_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.text
@@ -0,0 +1,88 @@
+from django.db.models import Count, F, Sum
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Category, Genre, Review, Title
+
+
+def _change_title_rating(title_id, score_delta, count_delta):
+    """Атомарно изменяет хранимые сумму и количество оценок произведения."""
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F("rating_sum") + score_delta,
+        rating_count=F("rating_count") + count_delta,
+        updated_at=timezone.now(),
+    )
+
+
+def _recalculate_title_rating(title_id):
+    """Пересчитывает рейтинг одного произведения по его отзывам."""
+    aggregate = Review.objects.filter(title_id=title_id).aggregate(
+        score_sum=Sum("score"), score_count=Count("id")
+    )
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=aggregate["score_sum"] or 0,
+        rating_count=aggregate["score_count"],
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    """Учитывает новую или измененную оценку в рейтинге произведения."""
+    old_title_id, old_score = getattr(
+        instance, "_rating_snapshot", (None, None)
+    )
+    if created:
+        _change_title_rating(instance.title_id, instance.score, 1)
+    elif old_title_id is None or old_score is None:
+        _recalculate_title_rating(instance.title_id)
+    elif old_title_id != instance.title_id:
+        _change_title_rating(old_title_id, -old_score, -1)
+        _change_title_rating(instance.title_id, instance.score, 1)
+    elif old_score != instance.score:
+        _change_title_rating(
+            instance.title_id, instance.score - old_score, 0
+        )
+    instance._rating_snapshot = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """Убирает оценку удаленного отзыва из рейтинга произведения."""
+    _change_title_rating(instance.title_id, -instance.score, -1)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_titles_on_category_change(sender, instance, **kwargs):
+    """Отмечает изменение произведений при изменении их категории."""
+    Title.objects.filter(category=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_titles_on_genre_change(sender, instance, **kwargs):
+    """Отмечает изменение произведений при изменении их жанра."""
+    Title.objects.filter(genre=instance).update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_titles_on_genre_set_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Отмечает изменение произведений при изменении набора их жанров."""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        titles = Title.objects.filter(pk=instance.pk)
+    elif pk_set:
+        titles = Title.objects.filter(pk__in=pk_set)
+    else:
+        titles = Title.objects.filter(genre=instance)
+    titles.update(updated_at=timezone.now())
@@ -2,7 +2,7 @@ from django.contrib import admin
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
 
-from .models import User
+from .models import OutboxEmail, User
 
 
 class UserResource(resources.ModelResource):
@@ -23,4 +23,17 @@ class UserAdmin(ImportExportModelAdmin):
     resource_classes = [UserResource]
 
 
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        "recipient",
+        "subject",
+        "created_at",
+        "sent_at",
+        "attempts",
+    )
+    list_filter = ("sent_at",)
+    search_fields = ("recipient",)
+
+
 admin.site.register(User, UserAdmin)
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
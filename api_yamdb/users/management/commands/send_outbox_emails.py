@@ -0,0 +1,126 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from users.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    help = "Отправляет письма из очереди исходящих писем."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help="Количество писем, отправляемых за одно соединение.",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            help="Количество попыток отправки письма.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Работать постоянно, проверяя очередь с интервалом.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+            help="Интервал проверки пустой очереди в секундах.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = self.send_batch(
+                options["batch_size"], options["max_attempts"]
+            )
+            if sent:
+                self.stdout.write(f"Обработано писем: {sent}")
+            if not options["loop"]:
+                return
+            if not sent:
+                time.sleep(options["interval"])
+
+    def claim_batch(self, batch_size, max_attempts):
+        """
+        Забирает пачку писем для отправки. Строки блокируются с SKIP
+        LOCKED, поэтому обработчиков может быть несколько, и до
+        фиксации транзакции откладываются на EMAIL_OUTBOX_CLAIM_TIMEOUT
+        секунд. Отправка идет уже после фиксации, медленный почтовый
+        сервер не держит блокировки, а письма упавшего обработчика
+        вернутся в очередь после этой паузы.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .filter(
+                    sent_at__isnull=True,
+                    attempts__lt=max_attempts,
+                    send_after__lte=now,
+                )
+                .order_by("send_after", "id")[:batch_size]
+            )
+            for email in batch:
+                email.attempts += 1
+                email.send_after = now + timedelta(
+                    seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT
+                )
+            OutboxEmail.objects.bulk_update(batch, ("attempts", "send_after"))
+        return batch
+
+    def send_batch(self, batch_size, max_attempts):
+        """
+        Отправляет одну пачку писем через одно соединение с почтовым сервером.
+        Неудачные письма откладываются с экспоненциальной паузой.
+        """
+        batch = self.claim_batch(batch_size, max_attempts)
+        if not batch:
+            return 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            for email in batch:
+                self.mark_failed(email, error)
+        else:
+            try:
+                for email in batch:
+                    self.send_email(connection, email)
+            finally:
+                connection.close()
+        OutboxEmail.objects.bulk_update(
+            batch, ("sent_at", "last_error", "send_after")
+        )
+        return len(batch)
+
+    def send_email(self, connection, email):
+        message = EmailMessage(
+            email.subject,
+            email.message,
+            email.from_email,
+            [email.recipient],
+            connection=connection,
+        )
+        try:
+            message.send()
+        except Exception as error:
+            self.mark_failed(email, error)
+        else:
+            email.sent_at = timezone.now()
+            email.last_error = ""
+
+    def mark_failed(self, email, error):
+        email.last_error = repr(error)
+        email.send_after = timezone.now() + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+            * 2 ** (email.attempts - 1)
+        )
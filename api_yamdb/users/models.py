@@ -1,8 +1,27 @@
 from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.utils import timezone
+
+from .signals import users_updated
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        Изменяет пользователей одним запросом и сообщает их id
+        сигналом users_updated, так как post_save не вызывается.
+        """
+        pks = list(self.values_list("pk", flat=True))
+        updated = super().update(**kwargs)
+        if updated:
+            users_updated.send(sender=self.model, pks=pks)
+        return updated
 
 
 class CustomUserManager(UserManager):
+    def get_queryset(self):
+        return UserQuerySet(self.model, using=self._db)
+
     def create_superuser(self, username, email, password, **extra_fields):
         extra_fields.setdefault("is_staff", True)
         extra_fields.setdefault("is_superuser", True)
@@ -33,3 +52,30 @@ class User(AbstractUser):
     )
 
     objects = CustomUserManager()
+
+
+class OutboxEmail(models.Model):
+    """Модель очереди исходящих писем."""
+
+    recipient = models.EmailField(max_length=254)
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=254)
+    created_at = models.DateTimeField(auto_now_add=True)
+    send_after = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ("send_after", "id")
+        indexes = [
+            models.Index(
+                fields=["send_after"],
+                name="outbox_pending_idx",
+                condition=models.Q(sent_at__isnull=True),
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.recipient}: {self.subject}"
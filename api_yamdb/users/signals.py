@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Отправляется после QuerySet.update() пользователей с аргументом pks -
+# списком id измененных пользователей: update() не вызывает post_save.
+users_updated = Signal()
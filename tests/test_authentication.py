@@ -0,0 +1,95 @@
+import pytest
+from api.authentication import _get_state_key, get_access_token
+from django.core.cache import cache
+from django.db import transaction
+from users.models import User
+
+
+@pytest.fixture
+def admin():
+    return User.objects.create(
+        username='admin', email='admin@example.com', role=User.ADMIN
+    )
+
+
+def get_users(api_client, user):
+    api_client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}'
+    )
+    return api_client.get('/api/v1/users/')
+
+
+@pytest.mark.django_db(transaction=True)
+class TestStatelessJWTAuthentication:
+
+    def test_token_without_users_query(
+        self, api_client, admin, settings, django_assert_num_queries
+    ):
+        settings.CACHE_SHARED = True
+        get_users(api_client, admin)
+        # список пользователей - COUNT и выборка, сам пользователь
+        # берется из токена и кеша
+        with django_assert_num_queries(2):
+            response = get_users(api_client, admin)
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('cache_shared', (True, False))
+    def test_demoted_by_queryset_update(
+        self, api_client, admin, settings, cache_shared
+    ):
+        settings.CACHE_SHARED = cache_shared
+        assert get_users(api_client, admin).status_code == 200
+        User.objects.filter(pk=admin.pk).update(role=User.USER)
+        assert get_users(api_client, admin).status_code in (401, 403), (
+            'Проверьте, что после понижения роли через QuerySet.update() '
+            'токен администратора больше не дает прав администратора'
+        )
+
+    @pytest.mark.parametrize('cache_shared', (True, False))
+    def test_deactivated(self, api_client, admin, settings, cache_shared):
+        settings.CACHE_SHARED = cache_shared
+        assert get_users(api_client, admin).status_code == 200
+        admin.is_active = False
+        admin.save()
+        assert get_users(api_client, admin).status_code == 401
+
+    def test_process_local_cache_reads_user(
+        self, api_client, admin, settings, django_assert_num_queries
+    ):
+        settings.CACHE_SHARED = False
+        get_users(api_client, admin)
+        with django_assert_num_queries(3):
+            response = get_users(api_client, admin)
+        assert response.status_code == 200
+
+    def test_late_stale_read_does_not_restore_state(
+        self, api_client, admin, settings
+    ):
+        settings.CACHE_SHARED = True
+        # запрос прочитал данные администратора из базы до понижения
+        # роли, а записывает их в кеш уже после сброса
+        key = _get_state_key(admin.pk)
+        stale_state = ('admin', User.ADMIN, False, True)
+        User.objects.filter(pk=admin.pk).update(role=User.USER)
+        cache.add(key, stale_state)
+        cache.set(key, stale_state)
+        assert get_users(api_client, admin).status_code in (401, 403), (
+            'Проверьте, что запоздавшая запись старых данных в кеш '
+            'не возвращает токену права администратора'
+        )
+
+    def test_rolled_back_save_is_not_published(
+        self, api_client, admin, settings
+    ):
+        settings.CACHE_SHARED = True
+        assert get_users(api_client, admin).status_code == 200
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                admin.role = User.USER
+                admin.save()
+                raise RuntimeError
+        admin.refresh_from_db()
+        assert get_users(api_client, admin).status_code == 200, (
+            'Проверьте, что данные откаченного сохранения '
+            'не попадают в кеш'
+        )
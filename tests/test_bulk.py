@@ -0,0 +1,179 @@
+import datetime as dt
+
+import pytest
+from api.authentication import get_access_token
+from reviews.models import Category, Genre, Title
+from users.models import User
+
+OLD = dt.datetime(2000, 1, 1)
+
+
+@pytest.fixture
+def admin_client(api_client):
+    admin = User.objects.create(
+        username='admin', email='admin@example.com', role=User.ADMIN
+    )
+    api_client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {get_access_token(admin)}'
+    )
+    return api_client
+
+
+@pytest.fixture
+def title():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(
+        name='Сталкер', year=1979, category=category, description='Зона'
+    )
+    title.genre.set([genre])
+    Title.objects.filter(pk=title.pk).update(updated_at=OLD)
+    return title
+
+
+def post_bulk(client, resource, items, **params):
+    return client.post(
+        f'/api/v1/{resource}/bulk/',
+        {'items': items, **params},
+        format='json',
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulk:
+
+    @pytest.mark.parametrize('resource,slug', (
+        ('categories', 'movie'),
+        ('genres', 'drama'),
+    ))
+    def test_rename_touches_titles(self, admin_client, title, resource, slug):
+        response = post_bulk(
+            admin_client, resource,
+            [{'name': 'Новое название', 'slug': slug}], upsert=True,
+        )
+        assert response.status_code == 200
+        assert response.json()['updated'] == 1
+        title.refresh_from_db()
+        assert title.updated_at > OLD, (
+            'Проверьте, что переименование категории или жанра '
+            'через bulk отмечает изменение их произведений'
+        )
+
+    def test_atomic_rolls_back(self, admin_client, title):
+        response = post_bulk(admin_client, 'titles', [
+            {'name': 'Солярис', 'year': 1972,
+             'category': 'movie', 'genre': ['drama']},
+            {'name': 'Зеркало', 'year': 1975,
+             'category': 'unknown', 'genre': ['drama']},
+        ])
+        assert response.status_code == 400
+        data = response.json()
+        assert data['errors'] == 1
+        assert [result['index'] for result in data['results']] == [1]
+        assert 'category' in data['results'][0]['errors']
+        assert Title.objects.count() == 1, (
+            'Проверьте, что в режиме atomic при ошибке ничего не сохраняется'
+        )
+
+    def test_partial_saves_valid_items(self, admin_client, title):
+        response = post_bulk(admin_client, 'titles', [
+            {'name': 'Солярис', 'year': 1972,
+             'category': 'movie', 'genre': ['drama']},
+            {'name': 'Зеркало', 'year': 1975,
+             'category': 'movie', 'genre': ['unknown']},
+        ], mode='partial')
+        assert response.status_code == 200
+        data = response.json()
+        assert (data['created'], data['errors']) == (1, 1)
+        created = Title.objects.get(name='Солярис')
+        assert data['results'][0]['id'] == created.pk
+        assert list(created.genre.values_list('slug', flat=True)) == [
+            'drama'
+        ]
+        assert not Title.objects.filter(name='Зеркало').exists(), (
+            'Проверьте, что в режиме partial элементы с ошибками '
+            'не сохраняются'
+        )
+
+    def test_existing_without_upsert(self, admin_client, title):
+        response = post_bulk(admin_client, 'titles', [
+            {'name': 'Сталкер', 'year': 1979,
+             'category': 'movie', 'genre': []},
+        ])
+        assert response.status_code == 400
+        assert 'non_field_errors' in response.json()['results'][0]['errors']
+
+    def test_upsert_keeps_description(self, admin_client, title):
+        Genre.objects.create(name='Фантастика', slug='sci-fi')
+        response = post_bulk(admin_client, 'titles', [
+            {'name': 'Сталкер', 'year': 1979,
+             'category': 'movie', 'genre': ['sci-fi']},
+        ], upsert=True)
+        assert response.status_code == 200
+        assert response.json()['updated'] == 1
+        title.refresh_from_db()
+        assert list(title.genre.values_list('slug', flat=True)) == [
+            'sci-fi'
+        ]
+        assert title.updated_at > OLD
+        assert title.description == 'Зона', (
+            'Проверьте, что upsert без поля description '
+            'не стирает описание произведения'
+        )
+
+    def test_upsert_replaces_description(self, admin_client, title):
+        response = post_bulk(admin_client, 'titles', [
+            {'name': 'Сталкер', 'year': 1979, 'description': 'Комната',
+             'category': 'movie', 'genre': ['drama']},
+        ], upsert=True)
+        assert response.status_code == 200
+        title.refresh_from_db()
+        assert title.description == 'Комната'
+
+    @pytest.mark.parametrize('resource,items', (
+        ('categories', [
+            {'name': 'Книга', 'slug': 'book'},
+            {'name': 'Повесть', 'slug': 'book'},
+        ]),
+        ('titles', [
+            {'name': 'Солярис', 'year': 1972,
+             'category': 'movie', 'genre': []},
+            {'name': 'Солярис', 'year': 1972,
+             'category': 'movie', 'genre': ['drama']},
+        ]),
+    ))
+    def test_duplicates_in_batch(self, admin_client, title, resource, items):
+        response = post_bulk(
+            admin_client, resource, items, mode='partial', upsert=True
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert (data['created'], data['errors']) == (1, 1), (
+            'Проверьте, что повтор внутри запроса - ошибка второго элемента'
+        )
+        assert data['results'][0]['status'] == 'created'
+        assert data['results'][1]['status'] == 'error'
+
+    def test_admin_only(self, api_client, title):
+        response = post_bulk(api_client, 'categories', [
+            {'name': 'Книга', 'slug': 'book'},
+        ])
+        assert response.status_code == 401
+        assert not Category.objects.filter(slug='book').exists()
+
+    @pytest.mark.parametrize('resource', ('categories', 'genres'))
+    def test_bulk_slug_reserved(self, admin_client, resource):
+        response = admin_client.post(
+            f'/api/v1/{resource}/',
+            {'name': 'Массовая', 'slug': 'bulk'},
+            format='json',
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что slug bulk занят адресом массовой загрузки'
+        )
+        assert 'slug' in response.json()
+        response = post_bulk(
+            admin_client, resource, [{'name': 'Массовая', 'slug': 'bulk'}]
+        )
+        assert response.status_code == 400
+        assert 'slug' in response.json()['results'][0]['errors']
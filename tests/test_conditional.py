@@ -0,0 +1,69 @@
+import pytest
+from reviews.models import Category, Title
+
+
+@pytest.fixture
+def title():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    return Title.objects.create(name='Сталкер', year=1979, category=category)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConditionalGet:
+    url = '/api/v1/titles/'
+
+    def test_list_etag(self, api_client, title):
+        response = api_client.get(self.url)
+        assert response.status_code == 200
+        etag = response['ETag']
+        assert 'Last-Modified' not in response, (
+            'Проверьте, что список не отдает Last-Modified'
+        )
+        response = api_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что неизмененный список отдается как 304'
+        )
+        assert response['ETag'] == etag
+        assert not response.content
+        Title.objects.create(name='Солярис', year=1972)
+        response = api_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения список отдается полностью'
+        )
+        assert response.json()['count'] == 2
+        assert response['ETag'] != etag
+
+    def test_list_etag_depends_on_query(self, api_client, title):
+        etag = api_client.get(self.url)['ETag']
+        response = api_client.get(
+            self.url, {'year': 1979}, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 200
+
+    def test_retrieve_validators(self, api_client, title):
+        url = f'{self.url}{title.pk}/'
+        response = api_client.get(url)
+        assert response.status_code == 200
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304, (
+            'Проверьте, что If-Modified-Since по Last-Modified '
+            'отдает 304'
+        )
+        title.name = 'Солярис'
+        title.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения объект отдается полностью'
+        )
+        assert response.json()['name'] == 'Солярис'
+        assert response['ETag'] != etag
+
+    def test_retrieve_modified_since_earlier(self, api_client, title):
+        response = api_client.get(
+            f'{self.url}{title.pk}/',
+            HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT',
+        )
+        assert response.status_code == 200
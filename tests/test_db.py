@@ -0,0 +1,67 @@
+import pytest
+from api.export import export_rows
+from api_yamdb import db
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from reviews.models import Title
+
+
+@pytest.fixture
+def usable_checks(monkeypatch):
+    calls = []
+    is_usable = connection.is_usable
+
+    def counted():
+        calls.append(True)
+        return is_usable()
+
+    monkeypatch.setattr(connection, 'is_usable', counted)
+    connection.ensure_connection()
+    return calls
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConnectionHealthChecks:
+
+    def test_recently_used_not_checked(self, usable_checks, settings):
+        settings.DB_CONN_HEALTH_CHECK_INTERVAL = 60
+        request_finished.send(sender=None)
+        request_started.send(sender=None)
+        assert usable_checks == [], (
+            'Проверьте, что недавно использованное соединение '
+            'не проверяется запросом к базе'
+        )
+
+    def test_idle_connection_checked(self, usable_checks, settings):
+        settings.DB_CONN_HEALTH_CHECK_INTERVAL = 0
+        request_finished.send(sender=None)
+        request_started.send(sender=None)
+        assert usable_checks == [True]
+        assert connection.connection is not None
+
+    def test_connection_with_error_checked(
+        self, usable_checks, settings, monkeypatch
+    ):
+        settings.DB_CONN_HEALTH_CHECK_INTERVAL = 60
+        setattr(connection, db.CHECKED_AT, 0)
+        monkeypatch.setattr(connection, 'errors_occurred', True)
+        db.check_connections_health()
+        assert usable_checks == [True]
+
+
+@pytest.mark.django_db
+class TestExportWithoutServerSideCursors:
+
+    def test_reads_by_id(self, settings, monkeypatch):
+        settings.EXPORT_CHUNK_SIZE = 2
+        titles = Title.objects.bulk_create(
+            Title(name=f'Произведение {index}', year=2000)
+            for index in range(5)
+        )
+        monkeypatch.setitem(
+            connection.settings_dict, 'DISABLE_SERVER_SIDE_CURSORS', True
+        )
+        _, rows = export_rows('titles')
+        assert [row[1] for row in rows] == [title.name for title in titles], (
+            'Проверьте, что без серверных курсоров выгружаются все строки'
+        )
@@ -0,0 +1,117 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+from users.management.commands.send_outbox_emails import Command
+from users.models import OutboxEmail
+
+RETRY_DELAY = 10
+
+
+class FailingBackend(BaseEmailBackend):
+    """Почтовый сервер, отклоняющий все письма."""
+
+    def send_messages(self, email_messages):
+        raise SMTPException('Сервер недоступен')
+
+
+def send_outbox(**options):
+    call_command('send_outbox_emails', stdout=StringIO(), **options)
+
+
+@pytest.fixture
+def email():
+    return OutboxEmail.objects.create(
+        recipient='user@example.com',
+        subject='Тема',
+        message='Код 123',
+        from_email='YaMDB',
+    )
+
+
+@pytest.mark.django_db
+class TestOutbox:
+
+    def test_signup_enqueues_email(self, api_client):
+        response = api_client.post(
+            '/api/v1/auth/signup/',
+            {'username': 'user', 'email': 'user@example.com'},
+            format='json',
+        )
+        assert response.status_code == 200
+        assert mail.outbox == [], (
+            'Проверьте, что при регистрации письмо не отправляется сразу'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipient == 'user@example.com'
+        assert email.sent_at is None
+
+    def test_command_sends_email(self, email, settings):
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        send_outbox()
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что send_outbox_emails отправляет письма из очереди'
+        )
+        message = mail.outbox[0]
+        assert message.to == ['user@example.com']
+        assert (message.subject, message.body) == ('Тема', 'Код 123')
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        assert email.attempts == 1
+        send_outbox()
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно'
+        )
+
+    def test_failed_email_retried_with_backoff(self, email, settings):
+        settings.EMAIL_BACKEND = 'tests.test_outbox.FailingBackend'
+        settings.EMAIL_OUTBOX_RETRY_DELAY = RETRY_DELAY
+        for attempt in range(1, 4):
+            started = timezone.now()
+            send_outbox(max_attempts=3)
+            email.refresh_from_db()
+            assert email.attempts == attempt
+            assert email.sent_at is None
+            assert 'Сервер недоступен' in email.last_error
+            delay = RETRY_DELAY * 2 ** (attempt - 1)
+            assert (
+                started + timedelta(seconds=delay)
+                <= email.send_after
+                <= timezone.now() + timedelta(seconds=delay)
+            ), 'Проверьте, что пауза перед повтором растет экспоненциально'
+            send_outbox(max_attempts=3)
+            email.refresh_from_db()
+            assert email.attempts == attempt, (
+                'Проверьте, что письмо не отправляется до конца паузы'
+            )
+            OutboxEmail.objects.update(send_after=timezone.now())
+        send_outbox(max_attempts=3)
+        email.refresh_from_db()
+        assert email.attempts == 3, (
+            'Проверьте, что после max_attempts попыток письмо '
+            'больше не отправляется'
+        )
+
+    def test_claimed_email_released_after_timeout(self, email, settings):
+        # обработчик упал после фиксации захвата, не отправив письмо
+        settings.EMAIL_OUTBOX_CLAIM_TIMEOUT = 60
+        claimed, = Command().claim_batch(batch_size=10, max_attempts=5)
+        assert claimed.pk == email.pk
+        send_outbox()
+        email.refresh_from_db()
+        assert email.sent_at is None, (
+            'Проверьте, что захваченное письмо не берет другой обработчик'
+        )
+        assert email.send_after >= timezone.now() + timedelta(seconds=50)
+        OutboxEmail.objects.update(send_after=timezone.now())
+        send_outbox()
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        assert email.attempts == 2
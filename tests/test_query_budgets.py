@@ -0,0 +1,143 @@
+import pytest
+from api.instrumentation import QueryBudgetExceeded, query_budget
+from api.slugs import SLUG_MAPS
+from api.views import (
+    CategoryViewSet,
+    CommentViewSet,
+    GenreViewSet,
+    ReviewViewSet,
+    TitleViewSet,
+)
+from rest_framework.test import APIRequestFactory
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def dataset():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    authors = [
+        User.objects.create(username=f'author{index}', email=f'{index}@a.ru')
+        for index in range(3)
+    ]
+    titles = []
+    for index in range(12):
+        title = Title.objects.create(
+            name=f'Произведение {index}', year=2000, category=category
+        )
+        title.genre.set(genres[:index % 2 + 1])
+        titles.append(title)
+    title = titles[0]
+    reviews = [
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=index + 5
+        )
+        for index, author in enumerate(authors)
+    ]
+    for author in authors:
+        Comment.objects.create(
+            review=reviews[0], author=author, text='Комментарий'
+        )
+    return {
+        'title': title.pk,
+        'review': reviews[0].pk,
+        'comment': reviews[0].comments.first().pk,
+    }
+
+
+BUDGETED_URLS = (
+    ('TitleViewSet.list', '/api/v1/titles/'),
+    ('TitleViewSet.list', '/api/v1/titles/?genre=comedy&category=movie'),
+    ('TitleViewSet.list', '/api/v1/titles/?fields=id,name,genre'),
+    ('TitleViewSet.list', '/api/v1/titles/?pagination=cursor'),
+    ('TitleViewSet.retrieve', '/api/v1/titles/{title}/'),
+    ('GenreViewSet.list', '/api/v1/genres/'),
+    ('CategoryViewSet.list', '/api/v1/categories/'),
+    ('ReviewViewSet.list', '/api/v1/titles/{title}/reviews/'),
+    ('ReviewViewSet.retrieve', '/api/v1/titles/{title}/reviews/{review}/'),
+    (
+        'CommentViewSet.list',
+        '/api/v1/titles/{title}/reviews/{review}/comments/',
+    ),
+    (
+        'CommentViewSet.retrieve',
+        '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/',
+    ),
+)
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+
+    def test_all_budgets_covered(self):
+        declared = {
+            f'{view_class.__name__}.{action}'
+            for view_class in (
+                TitleViewSet,
+                GenreViewSet,
+                CategoryViewSet,
+                ReviewViewSet,
+                CommentViewSet,
+            )
+            for action in view_class.query_budgets
+        }
+        assert declared == {name for name, _ in BUDGETED_URLS}, (
+            'Проверьте, что каждое действие с бюджетом запросов '
+            'проверяется тестом'
+        )
+
+    @pytest.mark.parametrize('cache_shared', (False, True))
+    @pytest.mark.parametrize('name, url', BUDGETED_URLS)
+    def test_within_budget(
+        self, api_client, dataset, settings, name, url, cache_shared
+    ):
+        settings.QUERY_BUDGET_ENFORCE = True
+        settings.CACHE_SHARED = cache_shared
+        if cache_shared:
+            # с общим кешем справочники слагов загружаются
+            # один раз на процесс
+            for slug_map in SLUG_MAPS.values():
+                slug_map.get_items()
+        response = api_client.get(url.format(**dataset))
+        assert response.status_code == 200, (
+            f'Проверьте, что {name} отвечает на запрос {url}'
+        )
+
+    def test_budget_exceeded(self, dataset, settings):
+        settings.QUERY_BUDGET_ENFORCE = True
+        view_class = query_budget(list=1)(
+            type('LimitedTitleViewSet', (TitleViewSet,), {})
+        )
+        view = view_class.as_view({'get': 'list'})
+        request = APIRequestFactory().get('/api/v1/titles/')
+        with pytest.raises(QueryBudgetExceeded):
+            view(request)
+
+    def test_budget_not_enforced(self, dataset, settings):
+        settings.QUERY_BUDGET_ENFORCE = False
+        view_class = query_budget(list=1)(
+            type('LimitedTitleViewSet', (TitleViewSet,), {})
+        )
+        view = view_class.as_view({'get': 'list'})
+        request = APIRequestFactory().get('/api/v1/titles/')
+        assert view(request).status_code == 200
+
+
+@pytest.mark.django_db
+class TestServerTiming:
+
+    def test_disabled_by_default(self, api_client, settings):
+        settings.SERVER_TIMING = False
+        response = api_client.get('/api/v1/genres/')
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что заголовок Server-Timing по умолчанию не отдается'
+        )
+
+    def test_enabled(self, api_client, settings):
+        settings.SERVER_TIMING = True
+        response = api_client.get('/api/v1/genres/')
+        assert 'queries' in response['Server-Timing']
@@ -0,0 +1,135 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg
+from reviews.models import Category, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def titles():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    return [
+        Title.objects.create(name=name, year=1979, category=category)
+        for name in ('Сталкер', 'Солярис')
+    ]
+
+
+@pytest.fixture
+def authors():
+    return [
+        User.objects.create(username=f'author{index}', email=f'{index}@a.ru')
+        for index in range(3)
+    ]
+
+
+def create_reviews(title, authors, scores):
+    return [
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=score
+        )
+        for author, score in zip(authors, scores)
+    ]
+
+
+def get_rating(title):
+    title.refresh_from_db()
+    return title.rating_sum, title.rating_count
+
+
+def get_average(title):
+    return Review.objects.filter(title=title).aggregate(
+        value=Avg('score')
+    )['value']
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_create(self, titles, authors):
+        title = titles[0]
+        assert title.rating is None
+        create_reviews(title, authors, (10, 7, 4))
+        assert get_rating(title) == (21, 3), (
+            'Проверьте, что новый отзыв учитывается в рейтинге произведения'
+        )
+        assert title.rating == get_average(title) == 7
+
+    def test_score_change(self, titles, authors):
+        title = titles[0]
+        review, _ = create_reviews(title, authors, (10, 6))
+        review.score = 2
+        review.save()
+        assert get_rating(title) == (8, 2)
+        review = Review.objects.get(pk=review.pk)
+        review.score = 4
+        review.save()
+        assert get_rating(title) == (10, 2), (
+            'Проверьте, что изменение оценки меняет только сумму оценок'
+        )
+        assert title.rating == get_average(title)
+
+    def test_save_without_snapshot(self, titles, authors):
+        title = titles[0]
+        review, = create_reviews(title, authors, (10,))
+        # объект без снимка оценки: рейтинг пересчитывается по отзывам
+        Review(
+            pk=review.pk, title=title, author=authors[0],
+            text='Отзыв', score=3, pub_date=review.pub_date,
+        ).save()
+        assert get_rating(title) == (3, 1)
+
+    def test_move_to_other_title(self, titles, authors):
+        first, second = titles
+        review, _ = create_reviews(first, authors, (9, 5))
+        review.title = second
+        review.score = 8
+        review.save()
+        assert get_rating(first) == (5, 1), (
+            'Проверьте, что перенесенный отзыв убирается из рейтинга '
+            'прежнего произведения'
+        )
+        assert get_rating(second) == (8, 1)
+
+    def test_delete(self, titles, authors):
+        title = titles[0]
+        review, _ = create_reviews(title, authors, (9, 5))
+        review.delete()
+        assert get_rating(title) == (5, 1)
+        Review.objects.get().delete()
+        assert get_rating(title) == (0, 0)
+        assert title.rating is None
+
+    def test_cascade_delete_user(self, titles, authors):
+        first, second = titles
+        create_reviews(first, authors, (9, 5, 1))
+        create_reviews(second, authors[1:], (3,))
+        authors[1].delete()
+        assert get_rating(first) == (10, 2), (
+            'Проверьте, что отзывы удаленного пользователя '
+            'убираются из рейтинга'
+        )
+        assert get_rating(second) == (0, 0)
+
+    def test_cascade_delete_title(self, titles, authors):
+        first, second = titles
+        create_reviews(first, authors, (9, 5))
+        create_reviews(second, authors, (7,))
+        first.delete()
+        assert not Review.objects.filter(title_id=first.pk).exists()
+        assert get_rating(second) == (7, 1)
+
+    def test_recalculate(self, titles, authors):
+        first, second = titles
+        create_reviews(first, authors, (10, 7, 3))
+        create_reviews(second, authors, (2,))
+        Title.objects.update(rating_sum=100, rating_count=1)
+        Title.objects.create(name='Зеркало', year=1975)
+        call_command('recalculate_ratings', stdout=StringIO())
+        for title in Title.objects.all():
+            assert title.rating == get_average(title), (
+                'Проверьте, что пересчитанный рейтинг совпадает '
+                'со средней оценкой отзывов'
+            )
+        assert get_rating(first) == (20, 3)
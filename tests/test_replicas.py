@@ -0,0 +1,60 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import DEFAULT_DB_ALIAS
+
+from api.replicas import (
+    PIN_KEY,
+    ReplicaRouter,
+    end_routing,
+    get_pin_key,
+    pin_to_primary,
+    start_routing,
+)
+from reviews.models import Title
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+    settings.CACHE_SHARED = True
+
+
+def anonymous_get(rf):
+    # nginx дописывает адрес клиента в конец X-Forwarded-For
+    request = rf.get('/api/v1/titles/', HTTP_X_FORWARDED_FOR='10.0.0.9')
+    request.user = AnonymousUser()
+    return request
+
+
+def db_for_read(request):
+    token = start_routing(request)
+    try:
+        return ReplicaRouter().db_for_read(Title)
+    finally:
+        end_routing(token)
+
+
+class TestReplicaRouting:
+
+    def test_anonymous_pin_uses_forwarded_ip(self, rf):
+        assert get_pin_key(anonymous_get(rf)) == PIN_KEY.format(
+            'ip:10.0.0.9'
+        ), 'Проверьте, что анонимный клиент определяется по X-Forwarded-For'
+
+    @pytest.mark.usefixtures('replicas')
+    def test_reads_from_replica(self, rf):
+        assert db_for_read(anonymous_get(rf)) == 'replica'
+
+    @pytest.mark.usefixtures('replicas')
+    def test_pinned_client_reads_primary(self, rf):
+        pin_to_primary(anonymous_get(rf))
+        assert db_for_read(anonymous_get(rf)) == DEFAULT_DB_ALIAS, (
+            'Проверьте, что после записи клиент читает из основной базы'
+        )
+
+    @pytest.mark.usefixtures('replicas')
+    def test_no_replicas_without_shared_cache(self, rf, settings):
+        settings.CACHE_SHARED = False
+        assert db_for_read(anonymous_get(rf)) == DEFAULT_DB_ALIAS, (
+            'Проверьте, что без общего кеша реплики не используются'
+        )
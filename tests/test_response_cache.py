@@ -0,0 +1,136 @@
+from contextlib import contextmanager
+
+import pytest
+from api.authentication import get_access_token
+from django.db import connection, transaction
+from reviews.models import Category, Genre, Title
+from users.models import User
+
+
+@pytest.fixture
+def dataset():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(name='Сталкер', year=1979, category=category)
+    title.genre.set([genre])
+    return {'category': category, 'genre': genre, 'title': title}
+
+
+@contextmanager
+def capture_on_commit_callbacks():
+    # в тесте без transaction=True транзакция не фиксируется,
+    # колбэки on_commit остаются в очереди соединения
+    callbacks = []
+    start = len(connection.run_on_commit)
+    yield callbacks
+    callbacks.extend(func for _, func in connection.run_on_commit[start:])
+
+
+def get_cache_status(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response['X-Cache']
+
+
+def assert_cached(client, url):
+    assert get_cache_status(client, url) == 'MISS'
+    assert get_cache_status(client, url) == 'HIT', (
+        'Проверьте, что повторный запрос списка берется из кеша'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('dataset')
+class TestResponseCacheInvalidation:
+
+    @pytest.mark.parametrize(
+        'url', ('/api/v1/titles/', '/api/v1/genres/', '/api/v1/categories/')
+    )
+    def test_miss_then_hit(self, api_client, url):
+        assert_cached(api_client, url)
+
+    def test_create(self, api_client):
+        assert_cached(api_client, '/api/v1/genres/')
+        Genre.objects.create(name='Комедия', slug='comedy')
+        response = api_client.get('/api/v1/genres/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что создание объекта сбрасывает кеш списка'
+        )
+        assert response.json()['count'] == 2
+
+    def test_update(self, api_client, dataset):
+        assert_cached(api_client, '/api/v1/titles/')
+        title = dataset['title']
+        title.name = 'Солярис'
+        title.save()
+        response = api_client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['name'] == 'Солярис'
+
+    def test_delete(self, api_client, dataset):
+        assert_cached(api_client, '/api/v1/categories/')
+        dataset['category'].delete()
+        response = api_client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 0
+
+    def test_related_resources(self, api_client, dataset):
+        assert_cached(api_client, '/api/v1/titles/')
+        genre = dataset['genre']
+        genre.name = 'Трагедия'
+        genre.save()
+        response = api_client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что изменение жанра сбрасывает кеш произведений'
+        )
+        assert response.json()['results'][0]['genre'] == [
+            {'name': 'Трагедия', 'slug': 'drama'}
+        ]
+        assert get_cache_status(api_client, '/api/v1/titles/') == 'HIT'
+        dataset['title'].genre.clear()
+        assert get_cache_status(api_client, '/api/v1/titles/') == 'MISS'
+
+    def test_review_through_api(self, api_client, dataset):
+        title = dataset['title']
+        assert_cached(api_client, '/api/v1/titles/')
+        user = User.objects.create(username='author', email='a@a.ru')
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}'
+        )
+        response = api_client.post(
+            f'/api/v1/titles/{title.pk}/reviews/',
+            {'text': 'Отзыв', 'score': 8},
+            format='json',
+        )
+        assert response.status_code == 201
+        response = api_client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что новый отзыв сбрасывает кеш произведений'
+        )
+        assert response.json()['results'][0]['rating'] == 8
+
+    def test_rolled_back_write_keeps_cache(self, api_client):
+        assert_cached(api_client, '/api/v1/genres/')
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Genre.objects.create(name='Комедия', slug='comedy')
+                raise RuntimeError
+        assert get_cache_status(api_client, '/api/v1/genres/') == 'HIT'
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('dataset')
+class TestResponseCacheOnCommit:
+
+    def test_invalidated_after_commit(self, api_client):
+        assert_cached(api_client, '/api/v1/genres/')
+        with capture_on_commit_callbacks() as callbacks:
+            Genre.objects.create(name='Комедия', slug='comedy')
+            assert get_cache_status(api_client, '/api/v1/genres/') == 'HIT', (
+                'Проверьте, что кеш сбрасывается только после фиксации '
+                'транзакции'
+            )
+        assert callbacks
+        for callback in callbacks:
+            callback()
+        assert get_cache_status(api_client, '/api/v1/genres/') == 'MISS'
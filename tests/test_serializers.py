@@ -0,0 +1,79 @@
+import pytest
+from api.benchmarks import _stock_list_serializer, benchmark_serializers
+from api.serializers import (
+    CommentSerializer,
+    FastListSerializer,
+    ReviewSerializer,
+    TitleSerializerRead,
+)
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def dataset():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    author = User.objects.create(username='author', email='a@a.ru')
+    titles = [
+        Title.objects.create(
+            name='Сталкер', year=1979, category=category, description='Зона'
+        ),
+        Title.objects.create(name='Зеркало', year=1975),
+        Title.objects.create(name='Солярис', year=1972, category=category),
+    ]
+    titles[0].genre.set(genres)
+    titles[2].genre.set(genres[1:])
+    review = Review.objects.create(
+        title=titles[0], author=author, text='Отзыв', score=7
+    )
+    Comment.objects.create(review=review, author=author, text='Комментарий')
+
+
+def get_objects(serializer_class):
+    if serializer_class is TitleSerializerRead:
+        return list(
+            Title.objects.select_related('category')
+            .prefetch_related('genre')
+            .order_by('id')
+        )
+    model = serializer_class.Meta.model
+    return list(model.objects.select_related('author').order_by('id'))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('dataset')
+class TestFastListSerializer:
+
+    def test_baseline_is_stock_drf(self):
+        serializer = _stock_list_serializer(TitleSerializerRead, [])
+        assert type(serializer) is serializers.ListSerializer
+        assert type(serializer.child.fields['genre']) is (
+            serializers.ListSerializer
+        ), 'Проверьте, что вложенные жанры в эталоне сериализует DRF'
+
+    @pytest.mark.parametrize('serializer_class', (
+        TitleSerializerRead,
+        ReviewSerializer,
+        CommentSerializer,
+    ))
+    def test_output_identical(self, serializer_class):
+        objects = get_objects(serializer_class)
+        fast = serializer_class(objects, many=True)
+        assert isinstance(fast, FastListSerializer)
+        renderer = JSONRenderer()
+        assert renderer.render(fast.data) == renderer.render(
+            _stock_list_serializer(serializer_class, objects).data
+        ), (
+            'Проверьте, что скомпилированный сериализатор выдает '
+            'те же данные, что и стандартный DRF'
+        )
+
+    def test_benchmark_reports_identical(self):
+        result = benchmark_serializers(rounds=1)
+        assert all(item['identical'] for item in result.values())
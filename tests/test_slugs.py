@@ -0,0 +1,30 @@
+import pytest
+from api.slugs import genre_slugs
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSlugMap:
+
+    def test_change_in_other_process_without_shared_cache(
+        self, api_client, settings
+    ):
+        settings.CACHE_SHARED = False
+        category = Category.objects.create(name='Фильм', slug='movie')
+        title = Title.objects.create(
+            name='Сталкер', year=1979, category=category
+        )
+        genre_slugs.get_items()
+        # bulk_create не вызывает сигналы: так выглядит изменение
+        # в другом процессе, версия которого осталась в его locmem
+        Genre.objects.bulk_create([Genre(name='Драма', slug='drama')])
+        title.genre.through.objects.create(
+            title_id=title.pk, genre_id=Genre.objects.get(slug='drama').pk
+        )
+        response = api_client.get('/api/v1/titles/?genre=drama')
+        assert response.status_code == 200
+        assert response.json()['count'] == 1, (
+            'Проверьте, что без общего кеша жанр ищется в базе, '
+            'а не в устаревшем справочнике процесса'
+        )
+        assert genre_slugs.get_id('drama') is not None
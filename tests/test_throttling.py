@@ -0,0 +1,49 @@
+import pytest
+
+URL = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def auth_rate(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'NUM_PROXIES': 1,
+        'DEFAULT_THROTTLE_RATES': {
+            **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'],
+            'auth': '2/min',
+        },
+    }
+
+
+def post_from(api_client, forwarded_for):
+    # nginx дописывает адрес клиента в конец X-Forwarded-For
+    return api_client.post(
+        URL, {}, format='json', HTTP_X_FORWARDED_FOR=forwarded_for
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('auth_rate')
+class TestAuthRateThrottle:
+
+    def test_limit_per_client(self, api_client):
+        for _ in range(2):
+            assert post_from(api_client, '10.0.0.1').status_code == 400
+        response = post_from(api_client, '10.0.0.1')
+        assert response.status_code == 429, (
+            'Проверьте, что запросы на получение токена ограничены по IP'
+        )
+        assert int(response['Retry-After']) > 0
+        assert post_from(api_client, '10.0.0.2').status_code == 400, (
+            'Проверьте, что клиенты за прокси не делят одну корзину'
+        )
+
+    def test_spoofed_forwarded_for(self, api_client):
+        for spoofed in ('1.1.1.1', '2.2.2.2'):
+            response = post_from(api_client, f'{spoofed}, 10.0.0.1')
+            assert response.status_code == 400
+        response = post_from(api_client, '3.3.3.3, 10.0.0.1')
+        assert response.status_code == 429, (
+            'Проверьте, что адрес, подставленный клиентом '
+            'в X-Forwarded-For, не обходит ограничение'
+        )
@@ -0,0 +1,84 @@
+import pytest
+from api.slugs import genre_slugs
+from reviews.models import Category, Genre, Title
+
+
+def create_titles(number):
+    category = Category.objects.create(name='Фильм', slug='movie')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    titles = Title.objects.bulk_create(
+        Title(name=f'Произведение {index}', year=2000, category=category)
+        for index in range(number)
+    )
+    if titles[0].pk is None:
+        titles = list(Title.objects.order_by('id'))
+    through = Title.genre.through
+    through.objects.bulk_create(
+        through(title_id=title.pk, genre_id=genre.pk)
+        for index, title in enumerate(titles)
+        for genre in ((drama, comedy) if index % 2 else (drama,))
+    )
+    return titles
+
+
+@pytest.mark.django_db
+class TestTitleListQueries:
+    url = '/api/v1/titles/'
+
+    @pytest.mark.parametrize('number', (10, 100, 1000))
+    def test_list_queries(self, api_client, django_assert_num_queries, number):
+        create_titles(number)
+        with django_assert_num_queries(3):
+            response = api_client.get(self.url, {'page_size': 100})
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == number, (
+            'Проверьте, что список произведений содержит все произведения'
+        )
+        assert len(data['results']) == min(number, 100)
+        assert all(
+            title['category'] == {'name': 'Фильм', 'slug': 'movie'}
+            and title['genre']
+            for title in data['results']
+        )
+
+    @pytest.mark.parametrize('number', (10, 100, 1000))
+    def test_last_page_queries(
+        self, api_client, django_assert_num_queries, number
+    ):
+        create_titles(number)
+        last_page = (number + 9) // 10
+        with django_assert_num_queries(3):
+            response = api_client.get(self.url, {'page': last_page})
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 10
+
+    @pytest.mark.parametrize('cache_shared', (False, True))
+    @pytest.mark.parametrize('number', (10, 100, 1000))
+    def test_genre_filter_queries(
+        self,
+        api_client,
+        django_assert_num_queries,
+        settings,
+        number,
+        cache_shared,
+    ):
+        titles = create_titles(number)
+        settings.CACHE_SHARED = cache_shared
+        if cache_shared:
+            # слаг жанра переводится в id по справочнику процесса
+            # без запроса к базе, справочник загружается заранее
+            genre_slugs.get_items()
+        with django_assert_num_queries(3):
+            response = api_client.get(
+                self.url, {'genre': 'comedy', 'page_size': 100}
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == number // 2, (
+            'Проверьте, что фильтр по жанру не размножает строки произведений'
+        )
+        ids = [title['id'] for title in data['results']]
+        assert len(ids) == len(set(ids))
+        assert ids == [title.pk for title in titles[1::2]][:100]